@@ -4,24 +4,64 @@ CKKC October 2025 Expedition Management System
 Ultra-portable Flask application for offline expedition management
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, make_response
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, g, make_response, stream_template, abort, Response, stream_with_context
+import numpy as np
 import os
 from dotenv import load_dotenv
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
 from psycopg2 import pool, errors
+from psycopg2.extras import execute_values, Json
+from contextlib import contextmanager
 from datetime import datetime
+import functools
+import gzip
+import hashlib
+import hmac
 import json
+import logging
 import math
+import time
 import csv
 import io
 import shutil
+import subprocess
+import tempfile
 import zipfile
 
 load_dotenv()
 
+# orjson is a drop-in speedup for JSON encode/decode; fall back to the
+# stdlib when it is not installed
+try:
+    import orjson
+
+    def _loads(value):
+        return orjson.loads(value)
+
+    def _dumps(value):
+        return orjson.dumps(value).decode()
+except ImportError:
+    from json import loads as _loads, dumps as _dumps
+
+# Constant JSON literals used to seed columns; no point re-encoding them
+EMPTY_JSON_LIST = '[]'
+
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'ckkc_whigpistle_expedition_2025_change_in_production')  # For flash messages
+app.logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
+
+# Compress the highly redundant text responses (CSV exports especially)
+# when flask-compress is installed; without it responses ship raw
+try:
+    from flask_compress import Compress
+except ImportError:
+    pass
+else:
+    app.config['COMPRESS_MIMETYPES'] = ['text/csv', 'application/json', 'text/html']
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    Compress(app)
 
 # Add custom Jinja2 filters
 @app.template_filter('from_json')
@@ -29,13 +69,17 @@ def from_json_filter(value):
     """Parse JSON string into Python object"""
     if not value:
         return []
+    if isinstance(value, (list, dict)):
+        # JSONB columns already arrive deserialized from the driver
+        return value
     try:
-        return json.loads(value)
+        return _loads(value)
     except (ValueError, TypeError):
         return []
 
 # Admin configuration
 ADMIN_PASSCODE = os.getenv('ADMIN_PASSCODE', 'expedition2025')  # Simple passcode for admin access
+ADMIN_PASSCODE_B = ADMIN_PASSCODE.encode('utf-8')  # Pre-encoded once for constant-time comparison
 
 # Database setup
 DATABASE_URL = os.getenv('DATABASE_URL', 'postgresql://localhost/expedition_db')
@@ -47,32 +91,142 @@ DATABASE_URL = os.getenv('DATABASE_URL', 'postgresql://localhost/expedition_db')
 # Database connection pool
 db_pool = None
 
+class PooledConnection(psycopg2.extensions.connection):
+    """Connection class handed out by the pool.
+
+    The C-level psycopg2 connection type has no __dict__, so the
+    bookkeeping attributes the pool relies on (_prepared, _last_used)
+    cannot be set on it directly; instances of this Python subclass can
+    carry them. The class attributes double as the never-set defaults.
+    """
+    _prepared = False
+    _last_used = 0.0
+
+class TimestampedConnectionPool(pool.ThreadedConnectionPool):
+    """Thread-safe connection pool that records when each connection was
+    last returned, so checkout can tell how long one has sat idle."""
+
+    def putconn(self, conn, key=None, close=False):
+        conn._last_used = time.monotonic()
+        super().putconn(conn, key=key, close=close)
+
 def init_connection_pool():
     """Initialize PostgreSQL connection pool"""
     global db_pool
     try:
-        db_pool = pool.SimpleConnectionPool(1, 20, DATABASE_URL)
+        # TCP keepalives let the kernel detect dead sockets (e.g. a
+        # serverless DB suspending) instead of an app-level probe
+        db_pool = TimestampedConnectionPool(
+            4, 32, DATABASE_URL, connection_factory=PooledConnection,
+            keepalives=1, keepalives_idle=30, keepalives_interval=10, keepalives_count=3)
         print("✓ PostgreSQL connection pool initialized")
     except (Exception, psycopg2.Error) as error:
         print(f"Error creating connection pool: {error}")
         raise
 
+def _ensure_prepared(conn):
+    """Issue server-side PREPARE statements once per pooled connection.
+
+    PostgreSQL then skips the parse+plan phase for the hot write paths
+    (registration INSERT, survey UPDATE) on every subsequent EXECUTE.
+    """
+    if getattr(conn, '_prepared', False):
+        return
+    with conn.cursor() as prep_cursor:
+        prep_cursor.execute('''
+        PREPARE insert_participant AS
+        INSERT INTO participants
+        (full_name, email, phone_number, address, emergency_contact, traveled_with, accommodation, other_accommodation,
+         participation_days, eating_at_expedition, roppel_trips, crf_compass_agreement, skills, have_instruments,
+         instruments_details, group_gear, group_gear_other_details, additional_info, waiver_acknowledged,
+         waiver_acknowledged_timestamp)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19, NOW())
+        ON CONFLICT ((lower(email))) DO NOTHING
+        RETURNING id
+        ''')
+        prep_cursor.execute('''
+        PREPARE update_survey_header AS
+        UPDATE survey_header
+        SET cave_name = $1, state = $2, county = $3, region = $4, survey_date = $5, fsb_number = $6,
+            area_in_cave = $7, time_in = $8, time_out = $9, survey_objective = $10,
+            conditions = $11, other_info = $12,
+            book_sketch_person = $13, instrument_reader = $14, tape_person = $15,
+            point_person = $16, trip_leader = $17, other_team_members = $18,
+            compass_id = $19, compass_frontsight = $20, compass_backsight = $21,
+            inclinometer_id = $22, inclinometer_frontsight = $23, inclinometer_backsight = $24,
+            crf_compass_course = $25, calibration_notes = $26, additional_equipment = $27,
+            instruments_crf_course = $28, data_accuracy = $29, survey_shots_json = $30,
+            updated_date = NOW()
+        WHERE id = $31
+        ''')
+        prep_cursor.execute('''
+        PREPARE insert_survey_header AS
+        INSERT INTO survey_header (
+            cave_name, state, county, region, survey_date, fsb_number, area_in_cave,
+            time_in, time_out, survey_objective, conditions, other_info,
+            book_sketch_person, instrument_reader, tape_person, point_person,
+            trip_leader, other_team_members, compass_id, compass_frontsight,
+            compass_backsight, inclinometer_id, inclinometer_frontsight,
+            inclinometer_backsight, crf_compass_course, calibration_notes,
+            additional_equipment, survey_shots_json, raw_data,
+            instruments_crf_course, data_accuracy, created_date
+        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16,
+                  $17, $18, $19, $20, $21, $22, $23, $24, $25, $26, $27, $28, $29, $30, $31, NOW())
+        RETURNING id
+        ''')
+        prep_cursor.execute('''
+        PREPARE insert_survey AS
+        INSERT INTO surveys (
+            cave_id, date, area_in_cave, objective, time_in, time_out,
+            conditions, survey_designation_raw, units_length, units_compass, units_clino
+        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, 'feet', 'degrees', 'degrees')
+        RETURNING survey_id
+        ''')
+        prep_cursor.execute('''
+        PREPARE ins_trip AS
+        INSERT INTO trips (
+            trip_name, trip_date, cave_name, objective, leader_name,
+            entry_time, exit_time, route_description, hazards,
+            required_skills, required_equipment, max_participants,
+            difficulty_level, notes, status, created_date
+        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, NOW())
+        ''')
+        prep_cursor.execute('''
+        PREPARE upd_trip AS
+        UPDATE trips SET
+            trip_name = $1, trip_date = $2, cave_name = $3, objective = $4,
+            leader_name = $5, entry_time = $6, exit_time = $7, route_description = $8,
+            hazards = $9, required_skills = $10, required_equipment = $11,
+            max_participants = $12, difficulty_level = $13, notes = $14, status = $15,
+            updated_date = NOW()
+        WHERE id = $16
+        ''')
+    conn._prepared = True
+
+# Re-validate connections that sat idle longer than this many seconds;
+# recent checkouts skip the probe round-trip entirely
+POOL_STALE_AFTER = 300
+
 def get_db_connection():
     """Get a database connection from pool with validation"""
     if db_pool is None:
         raise Exception("Connection pool not initialized")
     conn = db_pool.getconn()
-    # Test the connection to ensure it's not stale
-    try:
-        with conn.cursor() as test_cursor:
-            test_cursor.execute('SELECT 1')
-    except (psycopg2.OperationalError, psycopg2.InterfaceError):
-        # Connection is stale, close it and get a new one
+    # Ping long-idle connections and swap in a fresh one when the server
+    # has dropped them, instead of letting the request fail
+    while time.monotonic() - getattr(conn, '_last_used', 0) > POOL_STALE_AFTER:
         try:
-            conn.close()
-        except:
-            pass
-        conn = db_pool.getconn()
+            with conn.cursor() as probe:
+                probe.execute('SELECT 1')
+            break
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            db_pool.putconn(conn, close=True)
+            conn = db_pool.getconn()
+    # Stamp at checkout as well: a connection fresh from the pool (never
+    # returned through putconn) still carries the class default of 0 and
+    # would otherwise be probed on every checkout once the process ages
+    conn._last_used = time.monotonic()
+    _ensure_prepared(conn)
     return conn
 
 def return_connection(conn, error=False):
@@ -88,6 +242,59 @@ def return_connection(conn, error=False):
         else:
             db_pool.putconn(conn)
 
+@contextmanager
+def db():
+    """Check a connection out of the pool and return it exactly once.
+
+    On a clean exit the connection goes back to the pool; if the block
+    raised, it is closed instead so a broken connection never gets reused.
+    """
+    conn = get_db_connection()
+    error = False
+    try:
+        yield conn
+    except Exception:
+        error = True
+        raise
+    finally:
+        return_connection(conn, error=error)
+
+def request_db():
+    """Lazily check one pooled connection out for the current request.
+
+    The first caller in a request pays for the checkout; later calls in the
+    same request reuse it. The teardown handler below returns it exactly
+    once, even when a view bails out through an except branch.
+    """
+    if 'db_conn' not in g:
+        g.db_conn = get_db_connection()
+    return g.db_conn
+
+@app.teardown_request
+def _release_request_db(exc):
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        return_connection(conn, error=exc is not None)
+
+_admin_login_url = None
+
+def admin_required(view):
+    """Bounce unauthenticated admins before the view does any work.
+
+    The login URL is resolved once and reused, so the check costs a
+    session lookup and a branch per request.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not session.get('admin_authenticated'):
+            global _admin_login_url
+            if _admin_login_url is None:
+                _admin_login_url = url_for('admin_login')
+            return redirect(_admin_login_url)
+        return view(*args, **kwargs)
+    return wrapper
+
+
 def get_cursor(conn):
     """Get cursor with dict-like row factory"""
     return conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
@@ -99,21 +306,59 @@ def close_connection_pool():
 
 
 
+# Degrees-to-radians factor, inlined to skip the math.radians call per shot
+_DEG_TO_RAD = math.pi / 180.0
+
+# Numba is optional so deployment stays ultra-portable; without it the
+# inner kernel runs as plain Python
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+@njit(cache=True)
+def _shot_xyz(distance, sin_inc, cos_inc, sin_az, cos_az):
+    """JIT-compiled kernel over precomputed trig values; batch traverse
+    reductions call this repeatedly without re-entering the interpreter."""
+    horizontal_distance = distance * cos_inc
+    return horizontal_distance * sin_az, horizontal_distance * cos_az, distance * sin_inc
+
 def shot_to_cartesian(distance, azimuth_deg, inclination_deg):
     """Convert shot measurements to Cartesian coordinates (dx, dy, dz)"""
     if distance is None or azimuth_deg is None or inclination_deg is None:
         return 0.0, 0.0, 0.0
-    
-    inc_rad = math.radians(inclination_deg)
-    az_rad = math.radians(azimuth_deg)
-    
-    horizontal_distance = distance * math.cos(inc_rad)
-    
-    dx = horizontal_distance * math.sin(az_rad)  # East component
-    dy = horizontal_distance * math.cos(az_rad)  # North component  
-    dz = distance * math.sin(inc_rad)           # Up component (vertical)
-    
-    return dx, dy, dz
+
+    inc_rad = inclination_deg * _DEG_TO_RAD
+    az_rad = azimuth_deg * _DEG_TO_RAD
+
+    # dx = East, dy = North, dz = Up (vertical)
+    return _shot_xyz(distance, math.sin(inc_rad), math.cos(inc_rad),
+                     math.sin(az_rad), math.cos(az_rad))
+
+@functools.lru_cache(maxsize=4096)
+def shot_to_cartesian_cached(distance, azimuth_deg, inclination_deg):
+    """Memoized shot_to_cartesian for the common instrument-reading grids
+    (readings land on half-degree/tenth-of-a-foot steps, so repeats are
+    frequent across a survey)."""
+    return shot_to_cartesian(distance, azimuth_deg, inclination_deg)
+
+def shots_to_cartesian_np(distances, azimuths_deg, inclinations_deg):
+    """Convert whole arrays of shot measurements to Cartesian coordinates.
+
+    Batch counterpart to shot_to_cartesian: NumPy's C loops amortize the
+    per-shot Python dispatch and trig cost when reducing full surveys.
+    Returns (dx, dy, dz) arrays (East, North, Up).
+    """
+    distances = np.asarray(distances, dtype=float)
+    inc_rad = np.deg2rad(np.asarray(inclinations_deg, dtype=float))
+    az_rad = np.deg2rad(np.asarray(azimuths_deg, dtype=float))
+
+    horizontal = distances * np.cos(inc_rad)
+
+    return horizontal * np.sin(az_rad), horizontal * np.cos(az_rad), distances * np.sin(inc_rad)
 
 def calculate_variance(fs_value, bs_value):
     """Calculate variance between frontsight and backsight readings"""
@@ -121,28 +366,41 @@ def calculate_variance(fs_value, bs_value):
         return None
     return abs(fs_value - bs_value)
 
+@functools.lru_cache(maxsize=None)
+def _compiled_template(name):
+    """Look up a compiled Jinja Template object once per template name,
+    skipping the loader/environment lookup on subsequent requests."""
+    return app.jinja_env.get_template(name)
+
+def _render_static_page(name):
+    """Render a static-ish page from the cached Template with a short
+    public Cache-Control so reverse proxies can absorb repeat GETs."""
+    response = make_response(_compiled_template(name).render())
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
+
 @app.route('/')
 def dashboard():
     """Main dashboard"""
-    conn = None
     try:
-        # Get participant count
-        conn = get_db_connection()
-        cursor = get_cursor(conn)
-        cursor.execute('SELECT COUNT(*) as count FROM participants')
-        participant_count = cursor.fetchone()['count']
+        with db() as conn:
+            cursor = get_cursor(conn)
 
-        # Check if demo mode is enabled
-        cursor.execute("SELECT value FROM settings WHERE key = %s", ('demo_mode_enabled',))
-        demo_mode_row = cursor.fetchone()
-        demo_mode = demo_mode_row and demo_mode_row['value'] == 'true' if demo_mode_row else False
+            # Get participant count
+            cursor.execute('SELECT COUNT(*) as count FROM participants')
+            participant_count = cursor.fetchone()['count']
 
-        # Get disclaimer text if demo mode is on
-        disclaimer = None
-        if demo_mode:
-            cursor.execute("SELECT value FROM settings WHERE key = %s", ('demo_mode_disclaimer',))
-            disclaimer_row = cursor.fetchone()
-            disclaimer = disclaimer_row['value'] if disclaimer_row else None
+            # Check if demo mode is enabled
+            cursor.execute("SELECT value FROM settings WHERE key = %s", ('demo_mode_enabled',))
+            demo_mode_row = cursor.fetchone()
+            demo_mode = demo_mode_row and demo_mode_row['value'] == 'true' if demo_mode_row else False
+
+            # Get disclaimer text if demo mode is on
+            disclaimer = None
+            if demo_mode:
+                cursor.execute("SELECT value FROM settings WHERE key = %s", ('demo_mode_disclaimer',))
+                disclaimer_row = cursor.fetchone()
+                disclaimer = disclaimer_row['value'] if disclaimer_row else None
 
         return render_template('dashboard.html',
                              participant_count=participant_count,
@@ -150,85 +408,91 @@ def dashboard():
                              disclaimer=disclaimer)
     except Exception as e:
         app.logger.error(f"Error in dashboard: {e}")
-        if conn:
-            return_connection(conn, error=True)
         return render_template('dashboard.html', participant_count=0, demo_mode=False, disclaimer=None)
-    finally:
-        if conn:
-            return_connection(conn)
 
 @app.route('/register')
 def register_form():
     """Show registration form - default to clean design"""
-    return render_template('register_clean.html')
+    return _render_static_page('register_clean.html')
 
 @app.route('/register/clean')
 def register_clean():
     """Clean & Professional design"""
-    return render_template('register_clean.html')
+    return _render_static_page('register_clean.html')
 
 @app.route('/register/cave')
 def register_cave():
     """Cave-themed design"""
-    return render_template('register_cave.html')
+    return _render_static_page('register_cave.html')
+
+# Text fields on the registration form: (form name, required, label for error messages).
+# register_submit walks this schema instead of 20+ individual get().strip() calls.
+REGISTRATION_FIELDS = (
+    ('full_name', True, 'Full Name'),
+    ('email', True, 'Email Address'),
+    ('phone_number', True, 'Phone Number'),
+    ('address', True, 'Physical Address'),
+    ('emergency_contact', True, 'Emergency Contact'),
+    ('traveled_with', False, 'Traveled With'),
+    ('accommodation', True, 'Accommodation'),
+    ('other_accommodation', False, 'Other Accommodation'),
+    ('instruments_details', False, 'Survey Instrument Details'),
+    ('group_gear_other_details', False, 'Other Group Gear Details'),
+    ('additional_info', False, 'Additional Information'),
+)
 
 @app.route('/register', methods=['POST'])
 def register_submit():
     """Process registration form submission"""
+    # No file inputs on this form: refuse multipart so Werkzeug's slow
+    # multipart parser never runs on the hot registration path
+    if request.mimetype == 'multipart/form-data':
+        abort(415)
+
     try:
-        # Extract form data
-        full_name = request.form.get('full_name', '').strip()
-        email = request.form.get('email', '').strip()
-        phone_number = request.form.get('phone_number', '').strip()
-        address = request.form.get('address', '').strip()
-        emergency_contact = request.form.get('emergency_contact', '').strip()
-        traveled_with = request.form.get('traveled_with', '').strip()
-        accommodation = request.form.get('accommodation', '')
-        other_accommodation = request.form.get('other_accommodation', '').strip()
-        
-        print(f"  - full_name: '{full_name}'")
-        print(f"  - email: '{email}'")
-        print(f"  - phone_number: '{phone_number}'")
-        print(f"  - address: '{address}'")
-        print(f"  - emergency_contact: '{emergency_contact}'")
-        print(f"  - accommodation: '{accommodation}'")
-        
-        # Handle multi-select fields
-        participation_days = request.form.getlist('participation_days')
-        eating_at_expedition = 'eating_at_expedition' in request.form
-        roppel_trips = request.form.get('roppel_trips', '')
-        crf_compass_agreement = 'crf_compass_agreement' in request.form
-        skills = request.form.getlist('skills')
-        have_instruments = 'have_instruments' in request.form
-        instruments_details = request.form.get('instruments_details', '').strip()
-        group_gear = request.form.getlist('group_gear')
-        group_gear_other_details = request.form.get('group_gear_other_details', '').strip()
-        additional_info = request.form.get('additional_info', '').strip()
-        
-        print(f"  - participation_days: {participation_days}")
-        print(f"  - eating_at_expedition: {eating_at_expedition}")
-        print(f"  - roppel_trips: '{roppel_trips}'")
-        print(f"  - crf_compass_agreement: {crf_compass_agreement}")
-        print(f"  - skills: {skills}")
-        print(f"  - have_instruments: {have_instruments}")
-        print(f"  - group_gear: {group_gear}")
-        
-        # Validate required fields
-        required_fields = [full_name, email, phone_number, address, emergency_contact, accommodation]
-        
-        if not all(required_fields):
-            missing_fields = []
-            if not full_name: missing_fields.append('Full Name')
-            if not email: missing_fields.append('Email Address')
-            if not phone_number: missing_fields.append('Phone Number')
-            if not address: missing_fields.append('Physical Address')
-            if not emergency_contact: missing_fields.append('Emergency Contact')
-            if not accommodation: missing_fields.append('Accommodation')
-            
+        # One pass over the field schema: sanitize every text value and
+        # collect the missing required labels at the same time
+        form = request.form
+        data = {}
+        missing_fields = []
+        for name, required, label in REGISTRATION_FIELDS:
+            value = form.get(name, '').strip()
+            data[name] = value
+            if required and not value:
+                missing_fields.append(label)
+
+        full_name = data['full_name']
+        email = data['email']
+        phone_number = data['phone_number']
+        address = data['address']
+        emergency_contact = data['emergency_contact']
+        traveled_with = data['traveled_with']
+        accommodation = data['accommodation']
+        other_accommodation = data['other_accommodation']
+
+        # Handle multi-select and checkbox fields
+        participation_days = form.getlist('participation_days')
+        eating_at_expedition = 'eating_at_expedition' in form
+        roppel_trips = form.get('roppel_trips', '')
+        crf_compass_agreement = 'crf_compass_agreement' in form
+        skills = form.getlist('skills')
+        have_instruments = 'have_instruments' in form
+        instruments_details = data['instruments_details']
+        group_gear = form.getlist('group_gear')
+        group_gear_other_details = data['group_gear_other_details']
+        additional_info = data['additional_info']
+
+        # One guarded debug line instead of a dozen unconditional prints
+        if app.logger.isEnabledFor(logging.DEBUG):
+            app.logger.debug('registration payload: %s',
+                             {k: v for k, v in data.items() if k != 'phone_number'})
+
+        # Validate required fields (collected during the schema pass above)
+        if missing_fields:
             error_msg = f'Please fill in all required fields: {", ".join(missing_fields)}'
             flash(error_msg, 'error')
             return redirect(url_for('register_form'))
-        
+
         # Validate required selections (checkboxes/multi-select)
         if not participation_days:
             flash('Please select at least one participation day.', 'error')
@@ -263,41 +527,34 @@ def register_submit():
             return redirect(url_for('register_form'))
         
         
-        # Connect to database and check for duplicate email
-        conn = get_db_connection()
+        # Connect to database; the unique index on lower(email) handles duplicates
+        with db() as conn:
+            cursor = get_cursor(conn)
 
-        cursor = get_cursor(conn)
-        cursor = conn.cursor()
-        
-        # Check for existing email
-        existing_participant = cursor.execute(
-            'SELECT id, full_name FROM participants WHERE email = %s', (email,)
-        ).fetchone()
-        
-        if existing_participant:
-            return_connection(conn)
-            flash(f'Registration failed: Email {email} is already registered by {existing_participant["full_name"]}. Each participant must use a unique email address.', 'error')
-            return redirect(url_for('register_form'))
-        
-        insert_data = (
-            full_name, email, phone_number, address, emergency_contact, traveled_with, accommodation, other_accommodation,
-            json.dumps(participation_days), eating_at_expedition, roppel_trips, crf_compass_agreement,
-            json.dumps(skills), have_instruments, instruments_details, json.dumps(group_gear), group_gear_other_details, additional_info,
-            True  # waiver_acknowledged - always TRUE when form is submitted
-        )
+            insert_data = (
+                full_name, email, phone_number, address, emergency_contact, traveled_with, accommodation, other_accommodation,
+                Json(participation_days), eating_at_expedition, roppel_trips, crf_compass_agreement,
+                Json(skills), have_instruments, instruments_details, Json(group_gear), group_gear_other_details, additional_info,
+                True  # waiver_acknowledged - always TRUE when form is submitted
+            )
 
-        cursor.execute('''
-        INSERT INTO participants
-        (full_name, email, phone_number, address, emergency_contact, traveled_with, accommodation, other_accommodation,
-         participation_days, eating_at_expedition, roppel_trips, crf_compass_agreement, skills, have_instruments,
-         instruments_details, group_gear, group_gear_other_details, additional_info, waiver_acknowledged,
-         waiver_acknowledged_timestamp)
-        VALUES (%s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, NOW())
-        ''', insert_data)
-        
-        conn.commit()
-        return_connection(conn)
-        
+            # Statement is PREPAREd once per pooled connection; EXECUTE skips parse+plan.
+            # The ON CONFLICT clause makes the duplicate check a single race-free round-trip.
+            cursor.execute(
+                'EXECUTE insert_participant (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)',
+                insert_data)
+            inserted = cursor.fetchone()
+
+            if inserted is None:
+                # Duplicate email; look up the existing name only to build the message
+                cursor.execute('SELECT full_name FROM participants WHERE lower(email) = lower(%s)', (email,))
+                existing_participant = cursor.fetchone()
+                flash(f'Registration failed: Email {email} is already registered by {existing_participant["full_name"]}. Each participant must use a unique email address.', 'error')
+                return redirect(url_for('register_form'))
+
+            conn.commit()
+
+        _invalidate_participants_cache()
         flash(f'Successfully registered {full_name} for the expedition!', 'success')
         return redirect(url_for('dashboard'))
         
@@ -313,120 +570,116 @@ def participants_list():
     conn = None
     try:
         conn = get_db_connection()
-        cursor = get_cursor(conn)
+        # The template needs the total (and an emptiness check) before the
+        # stream is consumed, so count first on a plain cursor
+        with conn.cursor() as count_cursor:
+            count_cursor.execute('SELECT COUNT(*) FROM participants')
+            total_participants = count_cursor.fetchone()[0]
+        # Server-side cursor: rows stream from Postgres in batches of 200
+        # instead of one fetchall, keeping memory bounded as the roster grows.
+        # The JSONB array columns arrive as Python lists straight from the driver.
+        cursor = conn.cursor(name='participants_stream',
+                             cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor.itersize = 200
         cursor.execute('''
             SELECT * FROM participants
             ORDER BY registration_time DESC
         ''')
-        participants = cursor.fetchall()
-
-        # Parse JSON fields for display
-        participants_data = []
-        for p in participants:
-            participant_dict = dict(p)
-            participant_dict['participation_days'] = json.loads(p['participation_days'] or '[]')
-            participant_dict['skills'] = json.loads(p['skills'] or '[]')
-            participant_dict['group_gear'] = json.loads(p['group_gear'] or '[]')
-            participants_data.append(participant_dict)
-
-        return render_template('participants.html', participants=participants_data)
+
+        def generate_participants(conn=conn, cursor=cursor):
+            try:
+                for p in cursor:
+                    yield p
+            finally:
+                return_connection(conn)
+
+        return stream_template('participants.html',
+                               participants=generate_participants(),
+                               total_participants=total_participants)
     except Exception as e:
         app.logger.error(f"Error in participants_list: {e}")
         if conn:
             return_connection(conn, error=True)
-        return render_template('participants.html', participants=[])
-    finally:
-        if conn:
-            return_connection(conn)
+        return render_template('participants.html', participants=[],
+                               total_participants=0)
 
 @app.route('/trips')
 def trips_list():
     """View planned cave trips"""
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = get_cursor(conn)
-        cursor.execute('''
-            SELECT * FROM trips
-            ORDER BY trip_date ASC, created_date ASC
-        ''')
-        trips = cursor.fetchall()
+        with db() as conn:
+            cursor = get_cursor(conn)
+            # Format the date key/label in SQL so no per-row strptime/strftime
+            # work happens in Python
+            cursor.execute('''
+                SELECT *,
+                       to_char(trip_date, 'YYYY-MM-DD') AS date_key,
+                       to_char(trip_date, 'FMDay, FMMonth DD, YYYY') AS date_label
+                FROM trips
+                ORDER BY trip_date ASC, created_date ASC
+            ''')
+            trips = cursor.fetchall()
 
         # Group trips by date
         trips_by_date = {}
         for trip in trips:
-            if trip['trip_date']:
-                try:
-                    trip_date = datetime.strptime(str(trip['trip_date']), '%Y-%m-%d')
-                    date_key = trip_date.strftime('%Y-%m-%d')
-                    date_label = trip_date.strftime('%A, %B %d, %Y')
-
-                    if date_key not in trips_by_date:
-                        trips_by_date[date_key] = {
-                            'date_label': date_label,
-                            'trips': []
-                        }
-                    trips_by_date[date_key]['trips'].append(trip)
-                except (ValueError, TypeError):
-                    pass
+            date_key = trip['date_key']
+            if date_key:
+                if date_key not in trips_by_date:
+                    trips_by_date[date_key] = {
+                        'date_label': trip['date_label'],
+                        'trips': []
+                    }
+                trips_by_date[date_key]['trips'].append(trip)
 
         return render_template('trips.html', trips_by_date=trips_by_date)
     except Exception as e:
         app.logger.error(f"Error in trips_list: {e}")
-        if conn:
-            return_connection(conn, error=True)
         return render_template('trips.html', trips_by_date={})
-    finally:
-        if conn:
-            return_connection(conn)
 
 @app.route('/admin/')
+@admin_required
 def admin_dashboard():
     """Administration dashboard - requires passcode"""
-    # Check if user is authenticated
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
-    conn = get_db_connection()
+    with db() as conn:
+        cursor = get_cursor(conn)
 
-    
-    cursor = get_cursor(conn)
-    
-    # Get basic stats
-    cursor.execute('SELECT COUNT(*) as count FROM participants')
-    participant_count = cursor.fetchone()
-    
-    # Get participation days breakdown
-    cursor.execute('SELECT participation_days FROM participants WHERE participation_days IS NOT NULL')
-    participation_data = cursor.fetchall()
+        # Single round-trip: unnest the JSON arrays server-side and return
+        # pre-aggregated counts instead of decoding every row in Python
+        cursor.execute('''
+        SELECT 'total' AS kind, 'participants' AS key, COUNT(*) AS count FROM participants
+        UNION ALL
+        SELECT 'day', value, COUNT(*)
+        FROM participants, jsonb_array_elements_text(participation_days) AS value
+        WHERE participation_days IS NOT NULL
+        GROUP BY value
+        UNION ALL
+        SELECT 'skill', value, COUNT(*)
+        FROM participants, jsonb_array_elements_text(skills) AS value
+        WHERE skills IS NOT NULL
+        GROUP BY value
+        UNION ALL
+        SELECT 'eat', CASE WHEN eating_at_expedition THEN 'eating_yes' ELSE 'eating_no' END, COUNT(*)
+        FROM participants
+        GROUP BY 2
+        ''')
+        rows = cursor.fetchall()
+
+    participant_count = 0
     participation_days_count = {}
-    for row in participation_data:
-        if row['participation_days']:
-            days = json.loads(row['participation_days'])
-            for day in days:
-                participation_days_count[day] = participation_days_count.get(day, 0) + 1
-    
-    # Get eating at expedition count
-    eating_count = cursor.execute('''
-    SELECT 
-        SUM(CASE WHEN eating_at_expedition = 1 THEN 1 ELSE 0 END) as eating_yes,
-        SUM(CASE WHEN eating_at_expedition = 0 OR eating_at_expedition IS NULL THEN 1 ELSE 0 END) as eating_no
-    FROM participants
-    ''').fetchone()
-    
-    # Get skills breakdown
-    cursor.execute('SELECT skills FROM participants WHERE skills IS NOT NULL')
-    skills_data = cursor.fetchall()
     skills_count = {}
-    for row in skills_data:
-        if row['skills']:
-            skills = json.loads(row['skills'])
-            for skill in skills:
-                skills_count[skill] = skills_count.get(skill, 0) + 1
-    
-    return_connection(conn)
-    
-    return render_template('admin.html', 
+    eating_count = {'eating_yes': 0, 'eating_no': 0}
+    for row in rows:
+        if row['kind'] == 'total':
+            participant_count = row['count']
+        elif row['kind'] == 'day':
+            participation_days_count[row['key']] = row['count']
+        elif row['kind'] == 'skill':
+            skills_count[row['key']] = row['count']
+        else:
+            eating_count[row['key']] = row['count']
+
+    return render_template('admin.html',
                          participant_count=participant_count,
                          participation_days_count=participation_days_count,
                          eating_count=eating_count,
@@ -435,14 +688,20 @@ def admin_dashboard():
 @app.route('/admin/login')
 def admin_login():
     """Admin login page"""
-    return render_template('admin_login.html')
+    # This page renders flashed messages (e.g. after a failed login), so
+    # it must never be cached: a cached copy would swallow the flash and
+    # a shared proxy could serve one user's messages to another. Keep the
+    # compiled-template lookup but send no-store instead.
+    response = make_response(_compiled_template('admin_login.html').render())
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 @app.route('/admin/login', methods=['POST'])
 def admin_login_submit():
     """Process admin login"""
     passcode = request.form.get('passcode', '').strip()
     
-    if passcode == ADMIN_PASSCODE:
+    if hmac.compare_digest(passcode.encode('utf-8'), ADMIN_PASSCODE_B):
         session['admin_authenticated'] = True
         flash('Welcome to the admin dashboard!', 'success')
         return redirect(url_for('admin_dashboard'))
@@ -458,39 +717,52 @@ def admin_logout():
     return redirect(url_for('dashboard'))
 
 @app.route('/admin/registration-data')
+@admin_required
 def admin_registration_data():
     """Admin view/edit registration data"""
-    # Check if user is authenticated
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
-    conn = get_db_connection()
+    conn = None
+    try:
+        conn = get_db_connection()
 
-    
-    cursor = get_cursor(conn)
-    participants = cursor.execute('''
-    SELECT * FROM participants 
-    ORDER BY registration_time DESC
-    ''').fetchall()
-    return_connection(conn)
-    
-    return render_template('admin_registration_data.html', participants=participants)
+        with conn.cursor() as count_cursor:
+            count_cursor.execute('SELECT COUNT(*) FROM participants')
+            total_participants = count_cursor.fetchone()[0]
+
+        # Stream rows through a server-side cursor rather than one fetchall
+        cursor = conn.cursor(name='registration_data_stream',
+                             cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor.itersize = 200
+        cursor.execute('''
+        SELECT * FROM participants
+        ORDER BY registration_time DESC
+        ''')
+
+        def generate_participants(conn=conn, cursor=cursor):
+            try:
+                for p in cursor:
+                    yield p
+            finally:
+                return_connection(conn)
+
+        return stream_template('admin_registration_data.html',
+                               participants=generate_participants(),
+                               total_participants=total_participants)
+    except Exception as e:
+        app.logger.error(f"Error in admin_registration_data: {e}")
+        if conn:
+            return_connection(conn, error=True)
+        return render_template('admin_registration_data.html', participants=[],
+                               total_participants=0)
 
 @app.route('/admin/registration-data/edit/<int:participant_id>')
+@admin_required
 def admin_edit_participant(participant_id):
     """Edit specific participant"""
-    # Check if user is authenticated
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
-    conn = get_db_connection()
-
-    
-    cursor = get_cursor(conn)
-    participant = cursor.execute('''
+    cursor = get_cursor(request_db())
+    cursor.execute('''
     SELECT * FROM participants WHERE id = %s
-    ''', (participant_id,)).fetchone()
-    return_connection(conn)
+    ''', (participant_id,))
+    participant = cursor.fetchone()
     
     if not participant:
         flash('Participant not found.', 'error')
@@ -499,15 +771,15 @@ def admin_edit_participant(participant_id):
     return render_template('admin_edit_participant.html', participant=participant)
 
 @app.route('/admin/registration-data/edit/<int:participant_id>', methods=['POST'])
+@admin_required
 def admin_update_participant(participant_id):
     """Update participant data"""
-    # Check if user is authenticated
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
-    try:
-        conn = get_db_connection()
+    # Form has no file inputs; skip the multipart parser entirely
+    if request.mimetype == 'multipart/form-data':
+        abort(415)
 
+    try:
+        conn = request_db()
         cursor = get_cursor(conn)
         
         # Extract form data
@@ -528,8 +800,8 @@ def admin_update_participant(participant_id):
               accommodation, participant_id))
         
         conn.commit()
-        return_connection(conn)
-        
+        _invalidate_participants_cache()
+
         flash('Participant updated successfully.', 'success')
         return redirect(url_for('admin_registration_data'))
         
@@ -538,20 +810,16 @@ def admin_update_participant(participant_id):
         return redirect(url_for('admin_edit_participant', participant_id=participant_id))
 
 @app.route('/admin/registration-data/delete/<int:participant_id>', methods=['POST'])
+@admin_required
 def admin_delete_participant(participant_id):
     """Delete participant"""
-    # Check if user is authenticated
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
     try:
-        conn = get_db_connection()
-
+        conn = request_db()
         cursor = get_cursor(conn)
         cursor.execute('DELETE FROM participants WHERE id = %s', (participant_id,))
         conn.commit()
-        return_connection(conn)
-        
+        _invalidate_participants_cache()
+
         flash('Participant deleted successfully.', 'success')
     except Exception as e:
         flash(f'Error deleting participant: {str(e)}', 'error')
@@ -559,34 +827,54 @@ def admin_delete_participant(participant_id):
     return redirect(url_for('admin_registration_data'))
 
 @app.route('/admin/cave-survey-data')
+@admin_required
 def admin_cave_survey_data():
     """Admin view/edit cave survey data"""
-    # Check if user is authenticated
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
+    conn = None
     try:
-        conn = sqlite3.connect(CAVE_SURVEY_DATABASE)
-        conn.row_factory = psycopg2.extras.RealDictRow
-        surveys = cursor.execute('''
-        SELECT * FROM survey_header 
+        conn = get_db_connection()
+        # Count first on a plain cursor: the template shows the total and
+        # an empty state, neither of which can come from the stream
+        with conn.cursor() as count_cursor:
+            count_cursor.execute('SELECT COUNT(*) FROM survey_header')
+            total_surveys = count_cursor.fetchone()[0]
+        # Stream the headers through a server-side cursor; the shots JSON
+        # is excluded from the listing so rows stay small
+        cursor = conn.cursor(name='survey_headers_stream',
+                             cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor.itersize = 200
+        cursor.execute('''
+        SELECT id, cave_name, survey_date, created_date FROM survey_header
         ORDER BY created_date DESC
-        ''').fetchall()
-        return_connection(conn)
-        
-        return render_template('admin_cave_survey_data.html', surveys=surveys)
+        ''')
+
+        def generate_surveys(conn=conn, cursor=cursor):
+            try:
+                for survey in cursor:
+                    yield survey
+            finally:
+                return_connection(conn)
+
+        return stream_template('admin_cave_survey_data.html',
+                               surveys=generate_surveys(),
+                               total_surveys=total_surveys)
     except Exception as e:
+        if conn:
+            return_connection(conn, error=True)
         flash(f'Error accessing cave survey data: {str(e)}', 'error')
-        return render_template('admin_cave_survey_data.html', surveys=[])
+        return render_template('admin_cave_survey_data.html', surveys=[],
+                               total_surveys=0)
 
 @app.route('/admin/raw-data-viewer')
+@admin_required
 def admin_raw_data_viewer():
     """View all raw survey data from database"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = 500
 
+    conn = None
     try:
-        conn = sqlite3.connect(CAVE_SURVEY_DATABASE)
+        conn = get_db_connection()
         cursor = conn.cursor()
 
         # Get all caves
@@ -597,49 +885,59 @@ def admin_raw_data_viewer():
         cursor.execute('SELECT survey_id, cave_id, date, area_in_cave, objective FROM surveys ORDER BY survey_id;')
         surveys = cursor.fetchall()
 
-        # Get all shots
-        cursor.execute('SELECT * FROM shots ORDER BY survey_id, shot_id;')
-        shots = cursor.fetchall()
-
         # Get shot counts per survey
         cursor.execute('SELECT survey_id, COUNT(*) FROM shots GROUP BY survey_id ORDER BY survey_id;')
         shot_counts = cursor.fetchall()
+        total_shots = sum(count for _, count in shot_counts)
+
+        # Shots are the unbounded table: page them and stream through a
+        # server-side cursor so memory stays flat as surveys accumulate
+        shots_cursor = conn.cursor(name='raw_shots_stream')
+        shots_cursor.itersize = 500
+        shots_cursor.execute('''
+        SELECT * FROM shots
+        ORDER BY survey_id, shot_id
+        LIMIT %s OFFSET %s
+        ''', (per_page, (page - 1) * per_page))
+
+        def generate_shots(conn=conn, cursor=shots_cursor):
+            try:
+                for shot in cursor:
+                    yield shot
+            finally:
+                return_connection(conn)
 
-        return_connection(conn)
-
-        return render_template('admin_view_raw_data.html',
+        return stream_template('admin_view_raw_data.html',
                              caves=caves,
                              surveys=surveys,
-                             shots=shots,
-                             shot_counts=shot_counts)
+                             shots=generate_shots(),
+                             shot_counts=shot_counts,
+                             total_shots=total_shots,
+                             page=page,
+                             per_page=per_page)
     except Exception as e:
+        if conn:
+            return_connection(conn, error=True)
         flash(f'Error accessing raw data: {str(e)}', 'error')
         return redirect(url_for('admin_dashboard'))
 
 @app.route('/admin/survey/<int:survey_id>/view')
+@admin_required
 def admin_survey_view(survey_id):
     """View detailed survey data"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
     try:
-        conn = get_cave_survey_db_connection()
-        cursor.execute('SELECT * FROM survey_header WHERE id = %s', (survey_id,))
-        survey = cursor.fetchone()
-        return_connection(conn)
-        
+        with db() as conn:
+            cursor = get_cursor(conn)
+            cursor.execute('SELECT * FROM survey_header WHERE id = %s', (survey_id,))
+            survey = cursor.fetchone()
+
         if not survey:
             flash('Survey not found.', 'error')
             return redirect(url_for('admin_cave_survey_data'))
-        
-        # Parse survey shots JSON
-        survey_shots = []
-        if survey['survey_shots_json']:
-            try:
-                survey_shots = json.loads(survey['survey_shots_json'])
-            except json.JSONDecodeError:
-                pass
-        
+
+        # JSONB column: the driver already hands back a Python list
+        survey_shots = survey['survey_shots_json'] or []
+
         return render_template('admin_survey_view.html', survey=survey, survey_shots=survey_shots)
     
     except Exception as e:
@@ -647,78 +945,62 @@ def admin_survey_view(survey_id):
         return redirect(url_for('admin_cave_survey_data'))
 
 @app.route('/admin/survey/<int:survey_id>/edit')
+@admin_required
 def admin_survey_edit(survey_id):
     """Edit survey data"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
     try:
-        conn = get_cave_survey_db_connection()
-        cursor.execute('SELECT * FROM survey_header WHERE id = %s', (survey_id,))
-        survey = cursor.fetchone()
-        return_connection(conn)
-        
+        with db() as conn:
+            cursor = get_cursor(conn)
+            cursor.execute('SELECT * FROM survey_header WHERE id = %s', (survey_id,))
+            survey = cursor.fetchone()
+
         if not survey:
             flash('Survey not found.', 'error')
             return redirect(url_for('admin_cave_survey_data'))
-        
-        # Parse survey shots JSON
-        survey_shots = []
-        if survey['survey_shots_json']:
-            try:
-                survey_shots = json.loads(survey['survey_shots_json'])
-            except json.JSONDecodeError:
-                pass
-        
+
+        # JSONB column: the driver already hands back a Python list
+        survey_shots = survey['survey_shots_json'] or []
+
         return render_template('admin_survey_edit.html', survey=survey, survey_shots=survey_shots)
     
     except Exception as e:
         flash(f'Error accessing survey for editing: {str(e)}', 'error')
         return redirect(url_for('admin_cave_survey_data'))
 
+# Plain text fields shared by the survey edit form, extracted in one schema pass
+SURVEY_TEXT_FIELDS = (
+    'cave_name', 'state', 'county', 'region', 'survey_date', 'fsb_number',
+    'area_in_cave', 'time_in', 'time_out', 'survey_objective', 'conditions', 'other_info',
+    'book_sketch_person', 'instrument_reader', 'tape_person', 'point_person',
+    'trip_leader', 'other_team_members',
+    'compass_id', 'inclinometer_id', 'calibration_notes', 'additional_equipment',
+)
+
 @app.route('/admin/survey/<int:survey_id>/edit', methods=['POST'])
+@admin_required
 def admin_survey_update(survey_id):
     """Update survey data"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
-    try:
-        # Extract all form data
-        cave_name = request.form.get('cave_name', '').strip()
-        state = request.form.get('state', '').strip()
-        county = request.form.get('county', '').strip()
-        region = request.form.get('region', '').strip()
-        survey_date = request.form.get('survey_date', '').strip()
-        fsb_number = request.form.get('fsb_number', '').strip()
-        area_in_cave = request.form.get('area_in_cave', '').strip()
-        time_in = request.form.get('time_in', '').strip()
-        time_out = request.form.get('time_out', '').strip()
-        survey_objective = request.form.get('survey_objective', '').strip()
-        conditions = request.form.get('conditions', '').strip()
-        other_info = request.form.get('other_info', '').strip()
-
-        # Team information
-        book_sketch_person = request.form.get('book_sketch_person', '').strip()
-        instrument_reader = request.form.get('instrument_reader', '').strip()
-        tape_person = request.form.get('tape_person', '').strip()
-        point_person = request.form.get('point_person', '').strip()
-        trip_leader = request.form.get('trip_leader', '').strip()
-        other_team_members = request.form.get('other_team_members', '').strip()
+    # Form has no file inputs; skip the multipart parser entirely
+    if request.mimetype == 'multipart/form-data':
+        abort(415)
 
-        # Instrument information
-        compass_id = request.form.get('compass_id', '').strip()
-        compass_frontsight = request.form.get('compass_frontsight')
-        compass_backsight = request.form.get('compass_backsight')
-        inclinometer_id = request.form.get('inclinometer_id', '').strip()
-        inclinometer_frontsight = request.form.get('inclinometer_frontsight')
-        inclinometer_backsight = request.form.get('inclinometer_backsight')
-        crf_compass_course = 1 if request.form.get('crf_compass_course') else 0
-        calibration_notes = request.form.get('calibration_notes', '').strip()
-        additional_equipment = request.form.get('additional_equipment', '').strip()
-
-        # Form validation checkboxes
-        instruments_crf_course = 1 if request.form.get('instruments_crf_course') else 0
-        data_accuracy = 1 if request.form.get('data_accuracy') else 0
+    try:
+        # Extract all plain text form data in one pass over the schema
+        form = request.form
+        f = {name: form.get(name, '').strip() for name in SURVEY_TEXT_FIELDS}
+        cave_name = f['cave_name']
+        survey_date = f['survey_date']
+
+        # Instrument readings (validated as numbers elsewhere, so no strip)
+        compass_frontsight = form.get('compass_frontsight')
+        compass_backsight = form.get('compass_backsight')
+        inclinometer_frontsight = form.get('inclinometer_frontsight')
+        inclinometer_backsight = form.get('inclinometer_backsight')
+
+        # Checkboxes
+        crf_compass_course = 1 if form.get('crf_compass_course') else 0
+        instruments_crf_course = 1 if form.get('instruments_crf_course') else 0
+        data_accuracy = 1 if form.get('data_accuracy') else 0
 
         # Survey shots data
         from_stations = request.form.getlist('from_station[]')
@@ -758,31 +1040,24 @@ def admin_survey_update(survey_id):
             flash('Cave name and survey date are required.', 'error')
             return redirect(url_for('admin_survey_edit', survey_id=survey_id))
 
-        conn = get_cave_survey_db_connection()
-        cursor.execute('''
-            UPDATE survey_header
-            SET cave_name = %s, state = %s, county = %s, region = %s, survey_date = %s, fsb_number = %s,
-                area_in_cave = %s, time_in = %s, time_out = %s, survey_objective = %s,
-                conditions = %s, other_info = %s,
-                book_sketch_person = %s, instrument_reader = %s, tape_person = %s,
-                point_person = %s, trip_leader = %s, other_team_members = %s,
-                compass_id = %s, compass_frontsight = %s, compass_backsight = %s,
-                inclinometer_id = %s, inclinometer_frontsight = %s, inclinometer_backsight = %s,
-                crf_compass_course = %s, calibration_notes = %s, additional_equipment = %s,
-                instruments_crf_course = %s, data_accuracy = %s, survey_shots_json = %s
-            WHERE id = %s
-        ''', (cave_name, state, county, region, survey_date, fsb_number, area_in_cave,
-              time_in, time_out, survey_objective, conditions, other_info,
-              book_sketch_person, instrument_reader, tape_person, point_person,
-              trip_leader, other_team_members,
-              compass_id, compass_frontsight, compass_backsight,
-              inclinometer_id, inclinometer_frontsight, inclinometer_backsight,
-              crf_compass_course, calibration_notes, additional_equipment,
-              instruments_crf_course, data_accuracy, json.dumps(survey_shots), survey_id))
-        
-        conn.commit()
-        return_connection(conn)
-        
+        with db() as conn:
+            cursor = conn.cursor()
+            # Statement is PREPAREd once per pooled connection; EXECUTE skips parse+plan
+            cursor.execute(
+                'EXECUTE update_survey_header (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, '
+                '%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)',
+                (f['cave_name'], f['state'], f['county'], f['region'], f['survey_date'], f['fsb_number'],
+                  f['area_in_cave'], f['time_in'], f['time_out'], f['survey_objective'],
+                  f['conditions'], f['other_info'],
+                  f['book_sketch_person'], f['instrument_reader'], f['tape_person'], f['point_person'],
+                  f['trip_leader'], f['other_team_members'],
+                  f['compass_id'], compass_frontsight, compass_backsight,
+                  f['inclinometer_id'], inclinometer_frontsight, inclinometer_backsight,
+                  crf_compass_course, f['calibration_notes'], f['additional_equipment'],
+                  instruments_crf_course, data_accuracy, Json(survey_shots), survey_id))
+
+            conn.commit()
+
         flash('Survey updated successfully!', 'success')
         return redirect(url_for('admin_survey_view', survey_id=survey_id))
     
@@ -790,125 +1065,145 @@ def admin_survey_update(survey_id):
         flash(f'Error updating survey: {str(e)}', 'error')
         return redirect(url_for('admin_survey_edit', survey_id=survey_id))
 
+# Whole-document template for the survey export: one format_map call per
+# request instead of ~60 list appends and f-string evaluations
+SURVEY_EXPORT_TMPL = f"""{'=' * 80}
+CAVE SURVEY DATA EXPORT
+CKKC October 2025 Expedition
+{'=' * 80}
+
+BASIC INFORMATION
+{'-' * 80}
+Survey ID: {{id}}
+Cave Name: {{cave_name}}
+State: {{state}}
+County: {{county}}
+Region: {{region}}
+Survey Date: {{survey_date}}
+FSB Number: {{fsb_number}}
+Area in Cave: {{area_in_cave}}
+Time In: {{time_in}}
+Time Out: {{time_out}}
+Survey Objective: {{survey_objective}}
+Conditions: {{conditions}}
+Other Info: {{other_info}}
+
+SURVEY TEAM
+{'-' * 80}
+Book/Sketch Person: {{book_sketch_person}}
+Instrument Reader: {{instrument_reader}}
+Tape Person: {{tape_person}}
+Point Person: {{point_person}}
+Trip/Survey Leader: {{trip_leader}}
+Other Team Members: {{other_team_members}}
+
+INSTRUMENTS
+{'-' * 80}
+Compass ID: {{compass_id}}
+Compass Frontsight: {{compass_frontsight}}
+Compass Backsight: {{compass_backsight}}
+Inclinometer ID: {{inclinometer_id}}
+Inclinometer Frontsight: {{inclinometer_frontsight}}
+Inclinometer Backsight: {{inclinometer_backsight}}
+CRF Compass Course: {{crf_compass_course}}
+Calibration Notes: {{calibration_notes}}
+Additional Equipment: {{additional_equipment}}
+Instruments on CRF Course: {{instruments_crf_course}}
+Data Accuracy Confirmed: {{data_accuracy}}
+
+SURVEY SHOTS
+{'-' * 80}
+{{shots_block}}
+
+{'=' * 80}
+Created: {{created_date}}
+{'=' * 80}"""
+
+_SHOT_KEYS = ('from_station', 'to_station', 'distance', 'azimuth_fs', 'azimuth_bs',
+              'inclination_fs', 'inclination_bs', 'left', 'right', 'up', 'down', 'notes')
+
+_SHOT_HEADER = (f"{'From':<8} {'To':<8} {'Dist':<8} {'Az FS':<8} {'Az BS':<8} "
+                f"{'Inc FS':<8} {'Inc BS':<8} {'L':<6} {'R':<6} {'U':<6} {'D':<6} {'Notes':<20}\n"
+                + '-' * 80)
+
+_SHOT_ROW_FMT = ('{from_station:<8} {to_station:<8} {distance:<8} {azimuth_fs:<8} '
+                 '{azimuth_bs:<8} {inclination_fs:<8} {inclination_bs:<8} '
+                 '{left:<6} {right:<6} {up:<6} {down:<6} {notes:<20}')
+
+def _render_survey_export(survey):
+    """Render the plain-text export document for one survey row"""
+    # JSONB column: the driver already hands back a Python list
+    survey_shots = survey['survey_shots_json'] or []
+
+    if survey_shots:
+        shots_block = '\n'.join(
+            [_SHOT_HEADER] +
+            [_SHOT_ROW_FMT.format_map(
+                {k: ('' if shot.get(k) is None else shot.get(k)) for k in _SHOT_KEYS})
+             for shot in survey_shots])
+    else:
+        shots_block = 'No survey shots recorded'
+
+    safe = {k: (v or '') for k, v in dict(survey).items()}
+    safe['id'] = survey['id']
+    safe['created_date'] = survey['created_date']
+    safe['shots_block'] = shots_block
+    return SURVEY_EXPORT_TMPL.format_map(safe)
+
+@functools.lru_cache(maxsize=256)
+def _survey_export_blob(survey_id, updated_date):
+    """Build, gzip and fingerprint the export text for one survey revision.
+
+    Keyed on (survey_id, updated_date), so an edit naturally produces a
+    fresh cache entry while repeat downloads of an unchanged survey are
+    served from memory as pre-compressed bytes.
+    """
+    with db() as conn:
+        cursor = get_cursor(conn)
+        cursor.execute('SELECT * FROM survey_header WHERE id = %s', (survey_id,))
+        survey = cursor.fetchone()
+
+    if not survey:
+        return None
+
+    body = gzip.compress(_render_survey_export(survey).encode('utf-8'), compresslevel=6)
+    etag = '"%s"' % hashlib.md5(body).hexdigest()
+    return etag, body
+
 @app.route('/admin/survey/<int:survey_id>/export')
+@admin_required
 def admin_survey_export(survey_id):
     """Export survey data as text file"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-
     try:
-        conn = get_cave_survey_db_connection()
-        cursor.execute('SELECT * FROM survey_header WHERE id = %s', (survey_id,))
-        survey = cursor.fetchone()
-        return_connection(conn)
+        with db() as conn:
+            cursor = get_cursor(conn)
+            cursor.execute('SELECT cave_name, updated_date FROM survey_header WHERE id = %s', (survey_id,))
+            survey = cursor.fetchone()
 
-        if not survey:
+        blob = _survey_export_blob(survey_id, survey['updated_date']) if survey else None
+        if blob is None:
             flash('Survey not found', 'error')
             return redirect(url_for('admin_cave_survey_data'))
+        etag, body = blob
 
-        # Parse survey shots JSON
-        survey_shots = []
-        if survey['survey_shots_json']:
-            try:
-                survey_shots = json.loads(survey['survey_shots_json'])
-            except:
-                pass
-
-        # Build text file content
-        content = []
-        content.append("=" * 80)
-        content.append("CAVE SURVEY DATA EXPORT")
-        content.append("CKKC October 2025 Expedition")
-        content.append("=" * 80)
-        content.append("")
-
-        # Basic Information
-        content.append("BASIC INFORMATION")
-        content.append("-" * 80)
-        content.append(f"Survey ID: {survey['id']}")
-        content.append(f"Cave Name: {survey['cave_name'] or ''}")
-        content.append(f"State: {survey['state'] or ''}")
-        content.append(f"County: {survey['county'] or ''}")
-        content.append(f"Region: {survey['region'] or ''}")
-        content.append(f"Survey Date: {survey['survey_date'] or ''}")
-        content.append(f"FSB Number: {survey['fsb_number'] or ''}")
-        content.append(f"Area in Cave: {survey['area_in_cave'] or ''}")
-        content.append(f"Time In: {survey['time_in'] or ''}")
-        content.append(f"Time Out: {survey['time_out'] or ''}")
-        content.append(f"Survey Objective: {survey['survey_objective'] or ''}")
-        content.append(f"Conditions: {survey['conditions'] or ''}")
-        content.append(f"Other Info: {survey['other_info'] or ''}")
-        content.append("")
-
-        # Survey Team
-        content.append("SURVEY TEAM")
-        content.append("-" * 80)
-        content.append(f"Book/Sketch Person: {survey['book_sketch_person'] or ''}")
-        content.append(f"Instrument Reader: {survey['instrument_reader'] or ''}")
-        content.append(f"Tape Person: {survey['tape_person'] or ''}")
-        content.append(f"Point Person: {survey['point_person'] or ''}")
-        content.append(f"Trip/Survey Leader: {survey['trip_leader'] or ''}")
-        content.append(f"Other Team Members: {survey['other_team_members'] or ''}")
-        content.append("")
-
-        # Instruments
-        content.append("INSTRUMENTS")
-        content.append("-" * 80)
-        content.append(f"Compass ID: {survey['compass_id'] or ''}")
-        content.append(f"Compass Frontsight: {survey['compass_frontsight'] or ''}")
-        content.append(f"Compass Backsight: {survey['compass_backsight'] or ''}")
-        content.append(f"Inclinometer ID: {survey['inclinometer_id'] or ''}")
-        content.append(f"Inclinometer Frontsight: {survey['inclinometer_frontsight'] or ''}")
-        content.append(f"Inclinometer Backsight: {survey['inclinometer_backsight'] or ''}")
-        content.append(f"CRF Compass Course: {survey['crf_compass_course'] or ''}")
-        content.append(f"Calibration Notes: {survey['calibration_notes'] or ''}")
-        content.append(f"Additional Equipment: {survey['additional_equipment'] or ''}")
-        content.append(f"Instruments on CRF Course: {survey['instruments_crf_course'] or ''}")
-        content.append(f"Data Accuracy Confirmed: {survey['data_accuracy'] or ''}")
-        content.append("")
-
-        # Survey Shots
-        content.append("SURVEY SHOTS")
-        content.append("-" * 80)
-        if survey_shots:
-            # Header
-            content.append(f"{'From':<8} {'To':<8} {'Dist':<8} {'Az FS':<8} {'Az BS':<8} {'Inc FS':<8} {'Inc BS':<8} {'L':<6} {'R':<6} {'U':<6} {'D':<6} {'Notes':<20}")
-            content.append("-" * 80)
-
-            # Data rows
-            for shot in survey_shots:
-                line = (
-                    f"{shot.get('from_station', ''):<8} "
-                    f"{shot.get('to_station', ''):<8} "
-                    f"{shot.get('distance', ''):<8} "
-                    f"{shot.get('azimuth_fs', ''):<8} "
-                    f"{shot.get('azimuth_bs', ''):<8} "
-                    f"{shot.get('inclination_fs', ''):<8} "
-                    f"{shot.get('inclination_bs', ''):<8} "
-                    f"{shot.get('left', ''):<6} "
-                    f"{shot.get('right', ''):<6} "
-                    f"{shot.get('up', ''):<6} "
-                    f"{shot.get('down', ''):<6} "
-                    f"{shot.get('notes', ''):<20}"
-                )
-                content.append(line)
-        else:
-            content.append("No survey shots recorded")
+        # Repeat download of an unchanged survey: empty 304 instead of a body
+        if request.headers.get('If-None-Match') == etag:
+            return '', 304
 
-        content.append("")
-        content.append("=" * 80)
-        content.append(f"Created: {survey['created_date']}")
-        content.append("=" * 80)
-
-        # Create response with text file
-        text_content = '\n'.join(content)
         filename = f"survey_{survey['cave_name'].replace(' ', '_')}_{survey_id}.txt"
 
-        response = make_response(text_content)
-        response.headers['Content-Type'] = 'text/plain'
-        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+        # Stream the cached bytes in bounded slices rather than one
+        # monolithic response body
+        def generate(body=body, size=65536):
+            for i in range(0, len(body), size):
+                yield body[i:i + size]
 
-        return response
+        return Response(stream_with_context(generate()), headers={
+            'Content-Type': 'text/plain; charset=utf-8',
+            'Content-Encoding': 'gzip',
+            'ETag': etag,
+            'Content-Disposition': f'attachment; filename={filename}'
+        })
 
     except Exception as e:
         flash(f'Error exporting survey: {str(e)}', 'error')
@@ -921,84 +1216,123 @@ def admin_survey_delete(survey_id):
         return jsonify({'success': False, 'error': 'Not authenticated'})
 
     try:
-        conn = get_cave_survey_db_connection()
+        with db() as conn:
+            cursor = get_cursor(conn)
 
-        # Check if survey exists
-        cursor.execute('SELECT cave_name FROM survey_header WHERE id = %s', (survey_id,))
-        survey = cursor.fetchone()
-        if not survey:
-            return_connection(conn)
-            return jsonify({'success': False, 'error': 'Survey not found'})
+            # Check if survey exists
+            cursor.execute('SELECT cave_name FROM survey_header WHERE id = %s', (survey_id,))
+            survey = cursor.fetchone()
+            if not survey:
+                return jsonify({'success': False, 'error': 'Survey not found'})
 
-        # Delete survey
-        cursor.execute('DELETE FROM survey_header WHERE id = %s', (survey_id,))
-        conn.commit()
-        return_connection(conn)
+            # Delete survey
+            cursor.execute('DELETE FROM survey_header WHERE id = %s', (survey_id,))
+            conn.commit()
 
+        _invalidate_stats_cache()
         return jsonify({'success': True, 'message': f'Survey for {survey["cave_name"]} deleted successfully'})
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+# Short TTL cache for the polled stats endpoints: the payloads only
+# change on writes, so most hits skip the database entirely
+_STATS_TTL = 30
+_stats_cache = {}
+
+def _cached_stats(key, build):
+    now = time.monotonic()
+    hit = _stats_cache.get(key)
+    if hit and now - hit[0] < _STATS_TTL:
+        return hit[1]
+    payload = build()
+    _stats_cache[key] = (now, payload)
+    return payload
+
+def _invalidate_stats_cache():
+    _stats_cache.clear()
+
+# The full roster changes rarely; keep the last fetch around briefly so
+# repeated admin navigation reuses it instead of rescanning the table
+_PARTICIPANTS_TTL = 30
+_participants_cache = None
+
+def _all_participants(cursor):
+    global _participants_cache
+    now = time.monotonic()
+    if _participants_cache and now - _participants_cache[0] < _PARTICIPANTS_TTL:
+        return _participants_cache[1]
+    cursor.execute('SELECT * FROM participants ORDER BY full_name')
+    rows = cursor.fetchall()
+    _participants_cache = (now, rows)
+    return rows
+
+def _invalidate_participants_cache():
+    global _participants_cache
+    _participants_cache = None
+
 @app.route('/api/stats')
 def api_stats():
     """API endpoint for expedition statistics"""
-    conn = get_db_connection()
+    def build():
+        with db() as conn:
+            cursor = get_cursor(conn)
 
-    cursor = get_cursor(conn)
-    
-    stats = {
-        'total_participants': cursor.execute('SELECT COUNT(*) as count FROM participants').fetchone()['count'],
-        'accommodations': {},
-        'skills_count': {},
-        'participation_by_day': {}
-    }
-    
-    # Get accommodation breakdown
-    accommodations = cursor.execute('''
-    SELECT accommodation, COUNT(*) as count 
-    FROM participants 
-    GROUP BY accommodation
-    ''').fetchall()
-    
-    for acc in accommodations:
-        stats['accommodations'][acc['accommodation']] = acc['count']
-    
-    return_connection(conn)
-    return jsonify(stats)
+            cursor.execute('SELECT COUNT(*) as count FROM participants')
+            total_participants = cursor.fetchone()['count']
+
+            # Get accommodation breakdown
+            cursor.execute('''
+            SELECT accommodation, COUNT(*) as count
+            FROM participants
+            GROUP BY accommodation
+            ''')
+            accommodations = cursor.fetchall()
+
+        return {
+            'total_participants': total_participants,
+            'accommodations': {acc['accommodation']: acc['count'] for acc in accommodations},
+            'skills_count': {},
+            'participation_by_day': {}
+        }
+
+    return jsonify(_cached_stats('stats', build))
 
 @app.route('/api/cave-survey-stats')
 def api_cave_survey_stats():
     """API endpoint for cave survey statistics"""
-    conn = get_cave_survey_db_connection()
-    
-    stats = {
-        'total_caves': cursor.execute('SELECT COUNT(*) as count FROM caves').fetchone()['count'],
-        'total_surveys': cursor.execute('SELECT COUNT(*) as count FROM surveys').fetchone()['count'],
-        'total_shots': cursor.execute('SELECT COUNT(*) as count FROM shots').fetchone()['count'],
-        'total_distance': 0,
-        'caves': []
-    }
-    
-    # Get total distance surveyed
-    cursor.execute('SELECT SUM(distance) as total FROM shots WHERE distance IS NOT NULL')
-    total_distance_result = cursor.fetchone()
-    if total_distance_result and total_distance_result['total']:
-        stats['total_distance'] = round(total_distance_result['total'], 2)
-    
-    # Get caves list
-    cursor.execute('SELECT * FROM caves ORDER BY name')
-    caves = cursor.fetchall()
-    for cave in caves:
-        cave_dict = dict(cave)
-        cave_dict['survey_count'] = cursor.execute(
-            'SELECT COUNT(*) as count FROM surveys WHERE cave_id = %s', 
-            (cave['cave_id'],)
-        ).fetchone()['count']
-        stats['caves'].append(cave_dict)
-    
-    return_connection(conn)
-    return jsonify(stats)
+    def build():
+        with db() as conn:
+            cursor = get_cursor(conn)
+
+            # All four totals in one round-trip
+            cursor.execute('''
+            SELECT (SELECT COUNT(*) FROM caves) AS total_caves,
+                   (SELECT COUNT(*) FROM surveys) AS total_surveys,
+                   (SELECT COUNT(*) FROM shots) AS total_shots,
+                   (SELECT SUM(distance) FROM shots WHERE distance IS NOT NULL) AS total_distance
+            ''')
+            totals = cursor.fetchone()
+
+            # One GROUP BY join instead of a COUNT query per cave
+            cursor.execute('''
+            SELECT c.*, COUNT(s.survey_id) AS survey_count
+            FROM caves c
+            LEFT JOIN surveys s USING (cave_id)
+            GROUP BY c.cave_id
+            ORDER BY c.name
+            ''')
+            caves = cursor.fetchall()
+
+        return {
+            'total_caves': totals['total_caves'],
+            'total_surveys': totals['total_surveys'],
+            'total_shots': totals['total_shots'],
+            'total_distance': round(totals['total_distance'], 2) if totals['total_distance'] else 0,
+            'caves': [dict(cave) for cave in caves]
+        }
+
+    return jsonify(_cached_stats('cave_survey_stats', build))
 
 @app.route('/survey')
 def survey_form():
@@ -1012,9 +1346,6 @@ def survey_form():
 def survey_submit():
     """Process cave survey data submission"""
     try:
-        # Initialize cave survey database
-        init_cave_survey_db()
-        
         # Extract form data
         cave_name = request.form.get('cave_name', '').strip()
         state = request.form.get('state', '').strip()
@@ -1069,183 +1400,155 @@ def survey_submit():
         instruments_crf_course = 1 if request.form.get('instruments_crf_course') else 0
         data_accuracy = 1 if request.form.get('data_accuracy') else 0
         
-        # Basic validation
-        if not cave_name:
-            flash('Cave name is required.', 'error')
-            return redirect(url_for('survey_form'))
-        
-        if not survey_date:
-            flash('Survey date is required.', 'error')
-            return redirect(url_for('survey_form'))
-        
-        if not data_accuracy:
-            flash('You must confirm the accuracy of the survey data.', 'error')
-            return redirect(url_for('survey_form'))
-        
-        # Validate required team members
-        if not book_sketch_person:
-            flash('Book/Sketch person is required.', 'error')
-            return redirect(url_for('survey_form'))
-        
-        if not instrument_reader:
-            flash('Instrument reader is required.', 'error')
-            return redirect(url_for('survey_form'))
-        
-        if not tape_person:
-            flash('Tape person is required.', 'error')
-            return redirect(url_for('survey_form'))
-        
-        if not point_person:
-            flash('Point person is required.', 'error')
-            return redirect(url_for('survey_form'))
-        
-        if not trip_leader:
-            flash('Trip/Survey leader is required.', 'error')
-            return redirect(url_for('survey_form'))
-        
-        # Validate instrument IDs
-        if not compass_id:
-            flash('Compass ID is required.', 'error')
-            return redirect(url_for('survey_form'))
-        
-        if not inclinometer_id:
-            flash('Inclinometer ID is required.', 'error')
-            return redirect(url_for('survey_form'))
-        
-        # Validate CRF compass course confirmation
-        if not crf_compass_course:
-            flash('You must confirm that instruments were shot on the CRF Compass Course.', 'error')
+        # Collect every header and instrument error in one pass, so an
+        # invalid submission is reported in full and never checks a
+        # connection out of the pool
+        errors = []
+        for value, message in (
+            (cave_name, 'Cave name is required.'),
+            (survey_date, 'Survey date is required.'),
+            (data_accuracy, 'You must confirm the accuracy of the survey data.'),
+            (book_sketch_person, 'Book/Sketch person is required.'),
+            (instrument_reader, 'Instrument reader is required.'),
+            (tape_person, 'Tape person is required.'),
+            (point_person, 'Point person is required.'),
+            (trip_leader, 'Trip/Survey leader is required.'),
+            (compass_id, 'Compass ID is required.'),
+            (inclinometer_id, 'Inclinometer ID is required.'),
+            (crf_compass_course, 'You must confirm that instruments were shot on the CRF Compass Course.'),
+        ):
+            if not value:
+                errors.append(message)
+
+        def _check_reading(raw, out_of_range, message, label):
+            if raw and raw.strip():
+                try:
+                    value = float(raw)
+                except ValueError:
+                    errors.append(f'Invalid {label} value.')
+                else:
+                    if out_of_range(value):
+                        errors.append(message)
+
+        _check_reading(compass_frontsight, lambda v: v <= 180 or v > 360,
+                       'Compass frontsight must be > 180° (expected range 181-360°).', 'compass frontsight')
+        _check_reading(compass_backsight, lambda v: v < 0 or v >= 180,
+                       'Compass backsight must be < 180° (expected range 0-179°).', 'compass backsight')
+        _check_reading(inclinometer_frontsight, lambda v: v < -90 or v > 90,
+                       'Inclinometer frontsight must be between -90° and 90°.', 'inclinometer frontsight')
+        _check_reading(inclinometer_backsight, lambda v: v < -90 or v > 90,
+                       'Inclinometer backsight must be between -90° and 90°.', 'inclinometer backsight')
+
+        if errors:
+            for error in errors:
+                flash(error, 'error')
             return redirect(url_for('survey_form'))
-        
-        # Validate numeric ranges for instrument readings
-        if compass_frontsight and compass_frontsight.strip():
-            try:
-                fs_val = float(compass_frontsight)
-                if fs_val <= 180 or fs_val > 360:
-                    flash('Compass frontsight must be > 180° (expected range 181-360°).', 'error')
-                    return redirect(url_for('survey_form'))
-            except ValueError:
-                flash('Invalid compass frontsight value.', 'error')
-                return redirect(url_for('survey_form'))
-        
-        if compass_backsight and compass_backsight.strip():
-            try:
-                bs_val = float(compass_backsight)
-                if bs_val < 0 or bs_val >= 180:
-                    flash('Compass backsight must be < 180° (expected range 0-179°).', 'error')
-                    return redirect(url_for('survey_form'))
-            except ValueError:
-                flash('Invalid compass backsight value.', 'error')
-                return redirect(url_for('survey_form'))
-        
-        if inclinometer_frontsight and inclinometer_frontsight.strip():
-            try:
-                fs_incl = float(inclinometer_frontsight)
-                if fs_incl < -90 or fs_incl > 90:
-                    flash('Inclinometer frontsight must be between -90° and 90°.', 'error')
-                    return redirect(url_for('survey_form'))
-            except ValueError:
-                flash('Invalid inclinometer frontsight value.', 'error')
-                return redirect(url_for('survey_form'))
-        
-        if inclinometer_backsight and inclinometer_backsight.strip():
-            try:
-                bs_incl = float(inclinometer_backsight)
-                if bs_incl < -90 or bs_incl > 90:
-                    flash('Inclinometer backsight must be between -90° and 90°.', 'error')
-                    return redirect(url_for('survey_form'))
-            except ValueError:
-                flash('Invalid inclinometer backsight value.', 'error')
-                return redirect(url_for('survey_form'))
-        
-        # Process survey shots
-        survey_shots = []
-        valid_shot_count = 0
+
+
+        # Process survey shots as NumPy columns: the float conversion stays
+        # per-value Python, but every range check and the variance formula
+        # run as vectorized C loops over the whole page at once
+        n = len(from_stations)
         validation_errors = []
-        
-        for i in range(len(from_stations)):
-            if i < len(to_stations) and from_stations[i].strip() and to_stations[i].strip():
-                try:
-                    # Convert values to appropriate types, handling empty strings
-                    distance = float(distances[i]) if i < len(distances) and distances[i].strip() else None
-                    azimuth_fs = float(azimuth_fs_list[i]) if i < len(azimuth_fs_list) and azimuth_fs_list[i].strip() else None
-                    azimuth_bs = float(azimuth_bs_list[i]) if i < len(azimuth_bs_list) and azimuth_bs_list[i].strip() else None
-                    inclination_fs = float(inclination_fs_list[i]) if i < len(inclination_fs_list) and inclination_fs_list[i].strip() else None
-                    inclination_bs = float(inclination_bs_list[i]) if i < len(inclination_bs_list) and inclination_bs_list[i].strip() else None
-                    left = float(left_list[i]) if i < len(left_list) and left_list[i].strip() else 0
-                    right = float(right_list[i]) if i < len(right_list) and right_list[i].strip() else 0
-                    up = float(up_list[i]) if i < len(up_list) and up_list[i].strip() else 0
-                    down = float(down_list[i]) if i < len(down_list) and down_list[i].strip() else 0
-                    note = notes_list[i].strip() if i < len(notes_list) else ''
-                    
-                    # Validate survey shot data
-                    shot_id = i + 1
-                    
-                    # Validate distance
-                    if distance is not None and distance < 0:
-                        validation_errors.append(f'Shot {shot_id}: Distance cannot be negative')
-                    
-                    # Validate azimuth values
-                    if azimuth_fs is not None and (azimuth_fs < 0 or azimuth_fs >= 360):
-                        validation_errors.append(f'Shot {shot_id}: Frontsight azimuth must be 0-359°')
-                    
-                    if azimuth_bs is not None and (azimuth_bs < 0 or azimuth_bs >= 360):
-                        validation_errors.append(f'Shot {shot_id}: Backsight azimuth must be 0-359°')
-                    
-                    # Validate inclination values
-                    if inclination_fs is not None and (inclination_fs < -90 or inclination_fs > 90):
-                        validation_errors.append(f'Shot {shot_id}: Frontsight inclination must be -90° to 90°')
-                    
-                    if inclination_bs is not None and (inclination_bs < -90 or inclination_bs > 90):
-                        validation_errors.append(f'Shot {shot_id}: Backsight inclination must be -90° to 90°')
-                    
-                    # Validate LRUD values (must be non-negative)
-                    if left < 0 or right < 0 or up < 0 or down < 0:
-                        validation_errors.append(f'Shot {shot_id}: LRUD values cannot be negative')
-                    
-                    # Check for station name format (basic validation)
-                    from_station = from_stations[i].strip()
-                    to_station = to_stations[i].strip()
-                    
-                    if len(from_station) > 20:
-                        validation_errors.append(f'Shot {shot_id}: From station name too long (max 20 characters)')
-                    
-                    if len(to_station) > 20:
-                        validation_errors.append(f'Shot {shot_id}: To station name too long (max 20 characters)')
-                    
-                    # Warn about potential issues (commenting out variance checks for now to allow testing)
-                    if azimuth_fs is not None and azimuth_bs is not None:
-                        # Calculate azimuth variance - frontsight and backsight should differ by ~180°
-                        diff = abs(azimuth_fs - azimuth_bs)
-                        # Handle wrap-around case
-                        azimuth_variance = min(abs(diff - 180), abs(diff - 180 + 360), abs(diff - 180 - 360))
-                        if azimuth_variance > 5.0:  # More than 5 degrees variance (relaxed for testing)
-                            pass  # Temporarily disabled: validation_errors.append(f'Shot {shot_id}: Large azimuth variance ({azimuth_variance:.1f}°) - check readings')
-                    
-                    if inclination_fs is not None and inclination_bs is not None:
-                        incline_variance = abs(inclination_fs + inclination_bs)
-                        if incline_variance > 5.0:  # More than 5 degrees variance (relaxed for testing)
-                            pass  # Temporarily disabled: validation_errors.append(f'Shot {shot_id}: Large inclination variance ({incline_variance:.1f}°) - check readings')
-                    
-                    shot = {
-                        'from_station': from_station,
-                        'to_station': to_station,
-                        'distance': distance,
-                        'azimuth_fs': azimuth_fs,
-                        'azimuth_bs': azimuth_bs,
-                        'inclination_fs': inclination_fs,
-                        'inclination_bs': inclination_bs,
-                        'left': left,
-                        'right': right,
-                        'up': up,
-                        'down': down,
-                        'note': note
-                    }
-                    survey_shots.append(shot)
-                    valid_shot_count += 1
-                    
-                except ValueError as e:
-                    validation_errors.append(f'Shot {i + 1}: Invalid numeric value - {str(e)}')
+        conversion_errors = {}
+
+        def _pad(values, fill=''):
+            return list(values[:n]) + [fill] * (n - len(values))
+
+        # Local bindings skip a LOAD_GLOBAL per value in the conversion loop
+        _float = float
+
+        def _column(values, default=np.nan):
+            col = np.full(n, default, dtype=np.float64)
+            for i, raw in enumerate(values[:n]):
+                raw = raw.strip()
+                if raw:
+                    try:
+                        col[i] = _float(raw)
+                    except ValueError:
+                        conversion_errors.setdefault(i, f'Shot {i + 1}: Invalid numeric value - could not convert string to float: {raw!r}')
+            return col
+
+        from_list = [s.strip() for s in from_stations]
+        to_list = [s.strip() for s in _pad(to_stations)]
+        note_list = [s.strip() for s in _pad(notes_list)]
+
+        dist = _column(distances)
+        az_fs = _column(azimuth_fs_list)
+        az_bs = _column(azimuth_bs_list)
+        inc_fs = _column(inclination_fs_list)
+        inc_bs = _column(inclination_bs_list)
+        lrud_l = _column(left_list, default=0.0)
+        lrud_r = _column(right_list, default=0.0)
+        lrud_u = _column(up_list, default=0.0)
+        lrud_d = _column(down_list, default=0.0)
+
+        active = np.array([bool(f) and bool(t) for f, t in zip(from_list, to_list)], dtype=bool) \
+            if n else np.zeros(0, dtype=bool)
+
+        # The old per-row loop only parsed numerics on rows with both
+        # stations filled; a bad value on an inactive row just skips the
+        # shot, it does not block the submission
+        conversion_errors = {i: msg for i, msg in conversion_errors.items() if active[i]}
+
+        # NaN means "not entered" and compares False everywhere, which is
+        # exactly the None-skips-the-check behavior of the old loop
+        with np.errstate(invalid='ignore'):
+            checks = (
+                (active & (dist < 0), 'Distance cannot be negative'),
+                (active & ((az_fs < 0) | (az_fs >= 360)), 'Frontsight azimuth must be 0-359°'),
+                (active & ((az_bs < 0) | (az_bs >= 360)), 'Backsight azimuth must be 0-359°'),
+                (active & ((inc_fs < -90) | (inc_fs > 90)), 'Frontsight inclination must be -90° to 90°'),
+                (active & ((inc_bs < -90) | (inc_bs > 90)), 'Backsight inclination must be -90° to 90°'),
+                (active & ((lrud_l < 0) | (lrud_r < 0) | (lrud_u < 0) | (lrud_d < 0)),
+                 'LRUD values cannot be negative'),
+                (active & np.array([len(f) > 20 for f in from_list], dtype=bool),
+                 'From station name too long (max 20 characters)'),
+                (active & np.array([len(t) > 20 for t in to_list], dtype=bool),
+                 'To station name too long (max 20 characters)'),
+            )
+
+            # Variance warnings stay disabled for now, but the whole-page
+            # computation is a single vectorized pass when re-enabled:
+            # diff = np.abs(az_fs - az_bs)
+            # az_var = np.minimum.reduce([np.abs(diff - 180), np.abs(diff - 180 + 360), np.abs(diff - 180 - 360)])
+            # inc_var = np.abs(inc_fs + inc_bs)
+
+        bad_any = np.zeros(n, dtype=bool)
+        for mask, _ in checks:
+            bad_any |= mask
+
+        # Build error strings only for the failing rows
+        for i in np.nonzero(bad_any | np.isin(np.arange(n), list(conversion_errors)))[0]:
+            if i in conversion_errors:
+                validation_errors.append(conversion_errors[i])
+            for mask, message in checks:
+                if mask[i]:
+                    validation_errors.append(f'Shot {i + 1}: {message}')
+
+        def _opt(value):
+            # Plain float: psycopg2 does not adapt numpy scalars
+            return None if math.isnan(value) else float(value)
+
+        survey_shots = []
+        for i in np.nonzero(active)[0]:
+            if i in conversion_errors:
+                continue
+            survey_shots.append({
+                'from_station': from_list[i],
+                'to_station': to_list[i],
+                'distance': _opt(dist[i]),
+                'azimuth_fs': _opt(az_fs[i]),
+                'azimuth_bs': _opt(az_bs[i]),
+                'inclination_fs': _opt(inc_fs[i]),
+                'inclination_bs': _opt(inc_bs[i]),
+                'left': float(lrud_l[i]),
+                'right': float(lrud_r[i]),
+                'up': float(lrud_u[i]),
+                'down': float(lrud_d[i]),
+                'note': note_list[i]
+            })
+        valid_shot_count = len(survey_shots)
         
         # Check for validation errors
         if validation_errors:
@@ -1259,107 +1562,102 @@ def survey_submit():
             flash('At least one survey shot is required.', 'error')
             return redirect(url_for('survey_form'))
         
-        # Connect to cave survey database
-        conn = get_cave_survey_db_connection()
-        cursor = conn.cursor()
-        
-        # Convert numeric values to proper types
-        compass_fs_val = float(compass_frontsight) if compass_frontsight and compass_frontsight.strip() else None
-        compass_bs_val = float(compass_backsight) if compass_backsight and compass_backsight.strip() else None
-        inclinometer_fs_val = float(inclinometer_frontsight) if inclinometer_frontsight and inclinometer_frontsight.strip() else None
-        inclinometer_bs_val = float(inclinometer_backsight) if inclinometer_backsight and inclinometer_backsight.strip() else None
-        
-        # Insert survey header data
-        cursor.execute('''
-            INSERT INTO survey_header (
+        # Connect to cave survey database; db() returns the connection
+        # to the pool even when the submit fails partway through.
+        with db() as conn:
+            cursor = conn.cursor()
+        
+            # Convert numeric values to proper types
+            compass_fs_val = float(compass_frontsight) if compass_frontsight and compass_frontsight.strip() else None
+            compass_bs_val = float(compass_backsight) if compass_backsight and compass_backsight.strip() else None
+            inclinometer_fs_val = float(inclinometer_frontsight) if inclinometer_frontsight and inclinometer_frontsight.strip() else None
+            inclinometer_bs_val = float(inclinometer_backsight) if inclinometer_backsight and inclinometer_backsight.strip() else None
+        
+            # Insert survey header data via the per-connection prepared statement
+            cursor.execute(
+                'EXECUTE insert_survey_header (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, '
+                '%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)', (
                 cave_name, state, county, region, survey_date, fsb_number, area_in_cave,
                 time_in, time_out, survey_objective, conditions, other_info,
                 book_sketch_person, instrument_reader, tape_person, point_person,
-                trip_leader, other_team_members, compass_id, compass_frontsight,
-                compass_backsight, inclinometer_id, inclinometer_frontsight,
-                inclinometer_backsight, crf_compass_course, calibration_notes,
-                additional_equipment, survey_shots_json, raw_data,
-                instruments_crf_course, data_accuracy, created_date
-            ) VALUES (%s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, NOW())
-        ''', (
-            cave_name, state, county, region, survey_date, fsb_number, area_in_cave,
-            time_in, time_out, survey_objective, conditions, other_info,
-            book_sketch_person, instrument_reader, tape_person, point_person,
-            trip_leader, other_team_members, compass_id, compass_fs_val,
-            compass_bs_val, inclinometer_id, inclinometer_fs_val,
-            inclinometer_bs_val, crf_compass_course, calibration_notes,
-            additional_equipment, json.dumps(survey_shots), raw_data,
-            instruments_crf_course, data_accuracy
-        ))
-        
-        survey_id = cursor.lastrowid
-        
-        # Also store in professional schema for future use
-        # First, get or create the cave
-        cave_location = f"{county}, {state}" if county and state else (state or '')
-        cursor.execute('SELECT cave_id FROM caves WHERE name = %s AND location_text = %s', (cave_name, cave_location))
-        cave_row = cursor.fetchone()
-        
-        if cave_row:
-            cave_id = cave_row['cave_id']
-        else:
-            cursor.execute('INSERT INTO caves (name, location_text) VALUES (%s, %s)', (cave_name, cave_location))
-            cave_id = cursor.lastrowid
-        
-        # Insert survey into professional schema
-        cursor.execute('''
-            INSERT INTO surveys (
-                cave_id, date, area_in_cave, objective, time_in, time_out,
-                conditions, survey_designation_raw, units_length, units_compass, units_clino
-            ) VALUES (%s, %s, % s, %s, % s, %s, % s, %s, 'feet', 'degrees', 'degrees')
-        ''', (cave_id, survey_date, area_in_cave, survey_objective, time_in, time_out, conditions, 'Form Entry'))
+                trip_leader, other_team_members, compass_id, compass_fs_val,
+                compass_bs_val, inclinometer_id, inclinometer_fs_val,
+                inclinometer_bs_val, crf_compass_course, calibration_notes,
+                additional_equipment, Json(survey_shots, dumps=_dumps), raw_data,
+                instruments_crf_course, data_accuracy
+            ))
         
-        professional_survey_id = cursor.lastrowid
+            # lastrowid is always None on Postgres; the id comes back from RETURNING
+            survey_id = cursor.fetchone()[0]
         
-        # Insert shots into professional schema
-        for i, shot in enumerate(survey_shots):
+            # Also store in professional schema for future use
+            # Get or create the cave with one upsert against the
+            # (name, location_text) unique index
+            cave_location = f"{county}, {state}" if county and state else (state or '')
             cursor.execute('''
+                INSERT INTO caves (name, location_text) VALUES (%s, %s)
+                ON CONFLICT (name, location_text) DO NOTHING
+                RETURNING cave_id
+            ''', (cave_name, cave_location))
+            cave_row = cursor.fetchone()
+
+            if cave_row:
+                cave_id = cave_row[0]
+            else:
+                cursor.execute('SELECT cave_id FROM caves WHERE name = %s AND location_text = %s',
+                               (cave_name, cave_location))
+                cave_id = cursor.fetchone()[0]
+        
+            # Insert survey into professional schema via the prepared statement
+            cursor.execute(
+                'EXECUTE insert_survey (%s, %s, %s, %s, %s, %s, %s, %s)',
+                (cave_id, survey_date, area_in_cave, survey_objective, time_in, time_out, conditions, 'Form Entry'))
+        
+            professional_survey_id = cursor.fetchone()[0]
+        
+            # Insert shots into professional schema in one multi-VALUES round-trip
+            execute_values(cursor, '''
                 INSERT INTO shots (
                     survey_id, sequence_in_page, station_from, station_to, distance,
                     fs_azimuth_deg, bs_azimuth_deg, fs_incline_deg, bs_incline_deg,
                     lrud_left, lrud_right, lrud_up, lrud_down, note
-                ) VALUES (%s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s)
-            ''', (
-                professional_survey_id, i + 1, shot['from_station'], shot['to_station'],
-                shot['distance'], shot['azimuth_fs'], shot['azimuth_bs'],
-                shot['inclination_fs'], shot['inclination_bs'],
-                shot['left'], shot['right'], shot['up'], shot['down'], shot['note']
-            ))
-        
-        # Insert team members
-        team_roles = [
-            ('sketch_book', book_sketch_person),
-            ('foresight', instrument_reader),
-            ('backsight', tape_person),
-            ('other', point_person)
-        ]
-        
-        for role, person_name in team_roles:
-            if person_name:
-                # Get or create person
-                cursor.execute('SELECT person_id FROM people WHERE full_name = %s', (person_name,))
-                person_row = cursor.fetchone()
-                
-                if person_row:
-                    person_id = person_row['person_id']
-                else:
-                    cursor.execute('INSERT INTO people (full_name) VALUES (%s)', (person_name,))
-                    person_id = cursor.lastrowid
-                
-                # Insert team member
-                cursor.execute('''
+                ) VALUES %s
+            ''', [
+                (professional_survey_id, i + 1, shot['from_station'], shot['to_station'],
+                 shot['distance'], shot['azimuth_fs'], shot['azimuth_bs'],
+                 shot['inclination_fs'], shot['inclination_bs'],
+                 shot['left'], shot['right'], shot['up'], shot['down'], shot['note'])
+                for i, shot in enumerate(survey_shots)
+            ], page_size=500)
+        
+            # Insert team members: one atomic upsert for people, then one batch
+            # insert for the role assignments, instead of a SELECT-then-INSERT
+            # pair per role
+            team_roles = [
+                ('sketch_book', book_sketch_person),
+                ('foresight', instrument_reader),
+                ('backsight', tape_person),
+                ('other', point_person)
+            ]
+
+            names = list(dict.fromkeys(name for _, name in team_roles if name))
+            if names:
+                execute_values(cursor, '''
+                    INSERT INTO people (full_name) VALUES %s
+                    ON CONFLICT (full_name) DO UPDATE SET full_name = EXCLUDED.full_name
+                    RETURNING person_id, full_name
+                ''', [(name,) for name in names])
+                name_to_id = {full_name: person_id for person_id, full_name in cursor.fetchall()}
+
+                execute_values(cursor, '''
                     INSERT INTO survey_team (survey_id, person_id, display_name, role)
-                    VALUES (%s, %s, % s, %s)
-                ''', (professional_survey_id, person_id, person_name, role))
-        
-        conn.commit()
-        return_connection(conn)
+                    VALUES %s
+                ''', [(professional_survey_id, name_to_id[name], name, role)
+                      for role, name in team_roles if name])
         
+            conn.commit()
+        _invalidate_stats_cache()
+
         flash(f'Survey data for {cave_name} submitted successfully! Recorded {valid_shot_count} survey shots.', 'success')
         return redirect(url_for('dashboard'))
         
@@ -1378,37 +1676,31 @@ def favicon():
 
 # Trip Management Routes
 @app.route('/admin/trips')
+@admin_required
 def admin_trips():
     """Admin trip management page"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
-    conn = get_db_connection()
+    cursor = get_cursor(request_db())
+    cursor.execute('''
+        SELECT t.*,
+               (SELECT COUNT(*) FROM trip_participants tp
+                WHERE tp.trip_id = t.id) AS participant_count
+        FROM trips t
+        ORDER BY t.trip_date DESC, t.created_date DESC
+    ''')
+    trips = cursor.fetchall()
 
-    
-    cursor = get_cursor(conn)
-    trips = cursor.execute('''
-        SELECT * FROM trips 
-        ORDER BY trip_date DESC, created_date DESC
-    ''').fetchall()
-    return_connection(conn)
-    
     return render_template('admin_trips.html', trips=trips)
 
 @app.route('/admin/trips/new')
+@admin_required
 def admin_new_trip():
     """Create new trip form"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
     return render_template('admin_trip_form.html', trip=None)
 
 @app.route('/admin/trips/new', methods=['POST'])
+@admin_required
 def admin_create_trip():
     """Create new trip"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
     try:
         # Get form data
         trip_name = request.form.get('trip_name', '').strip()
@@ -1432,27 +1724,20 @@ def admin_create_trip():
         if not trip_name or not trip_date or not cave_name:
             flash('Trip name, date, and cave name are required.', 'error')
             return redirect(url_for('admin_new_trip'))
-        
-        conn = get_db_connection()
 
-        
+        conn = request_db()
         cursor = get_cursor(conn)
-        cursor.execute('''
-            INSERT INTO trips (
-                trip_name, trip_date, cave_name, objective, leader_name, 
-                entry_time, exit_time, route_description, hazards, 
-                required_skills, required_equipment, max_participants, 
-                difficulty_level, notes, participants, status, created_date
-            ) VALUES (%s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, % s, %s, NOW())
-        ''', (
-            trip_name, trip_date, cave_name, objective, leader_name,
-            entry_time, exit_time, route_description, hazards,
-            json.dumps(required_skills), json.dumps(required_equipment),
-            max_participants, difficulty_level, notes, json.dumps([]), 'planned'
-        ))
+        cursor.execute(
+            'EXECUTE ins_trip (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)',
+            (
+                trip_name, trip_date, cave_name, objective, leader_name,
+                entry_time, exit_time, route_description, hazards,
+                _dumps(required_skills) if required_skills else EMPTY_JSON_LIST,
+                _dumps(required_equipment) if required_equipment else EMPTY_JSON_LIST,
+                max_participants, difficulty_level, notes, 'planned'
+            ))
         conn.commit()
-        return_connection(conn)
-        
+
         flash(f'Trip "{trip_name}" created successfully!', 'success')
         return redirect(url_for('admin_trips'))
         
@@ -1461,19 +1746,13 @@ def admin_create_trip():
         return redirect(url_for('admin_new_trip'))
 
 @app.route('/admin/trips/<int:trip_id>')
+@admin_required
 def admin_edit_trip(trip_id):
     """Edit trip form"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
-    conn = get_db_connection()
-
-    
-    cursor = get_cursor(conn)
+    cursor = get_cursor(request_db())
     cursor.execute('SELECT * FROM trips WHERE id = %s', (trip_id,))
     trip = cursor.fetchone()
-    return_connection(conn)
-    
+
     if not trip:
         flash('Trip not found.', 'error')
         return redirect(url_for('admin_trips'))
@@ -1481,11 +1760,9 @@ def admin_edit_trip(trip_id):
     return render_template('admin_trip_form.html', trip=trip)
 
 @app.route('/admin/trips/<int:trip_id>', methods=['POST'])
+@admin_required
 def admin_update_trip(trip_id):
     """Update existing trip"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
     try:
         # Get form data (same as create)
         trip_name = request.form.get('trip_name', '').strip()
@@ -1508,28 +1785,19 @@ def admin_update_trip(trip_id):
         if not trip_name or not trip_date or not cave_name:
             flash('Trip name, date, and cave name are required.', 'error')
             return redirect(url_for('admin_edit_trip', trip_id=trip_id))
-        
-        conn = get_db_connection()
 
-        
+        conn = request_db()
         cursor = get_cursor(conn)
-        cursor.execute('''
-            UPDATE trips SET 
-                trip_name = %s, trip_date = %s, cave_name = %s, objective = %s, 
-                leader_name = %s, entry_time = %s, exit_time = %s, route_description = %s, 
-                hazards = %s, required_skills = %s, required_equipment = %s, 
-                max_participants = %s, difficulty_level = %s, notes = %s, status = %s,
-                updated_date = NOW()
-            WHERE id = %s
-        ''', (
-            trip_name, trip_date, cave_name, objective, leader_name,
-            entry_time, exit_time, route_description, hazards,
-            json.dumps(required_skills), json.dumps(required_equipment),
-            max_participants, difficulty_level, notes, status, trip_id
-        ))
+        cursor.execute(
+            'EXECUTE upd_trip (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)',
+            (
+                trip_name, trip_date, cave_name, objective, leader_name,
+                entry_time, exit_time, route_description, hazards,
+                _dumps(required_skills), _dumps(required_equipment),
+                max_participants, difficulty_level, notes, status, trip_id
+            ))
         conn.commit()
-        return_connection(conn)
-        
+
         flash(f'Trip "{trip_name}" updated successfully!', 'success')
         return redirect(url_for('admin_trips'))
         
@@ -1538,91 +1806,73 @@ def admin_update_trip(trip_id):
         return redirect(url_for('admin_edit_trip', trip_id=trip_id))
 
 @app.route('/admin/trips/<int:trip_id>/delete', methods=['POST'])
+@admin_required
 def admin_delete_trip(trip_id):
     """Delete trip"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
     try:
-        conn = get_db_connection()
-
+        conn = request_db()
         cursor = get_cursor(conn)
         cursor.execute('SELECT trip_name FROM trips WHERE id = %s', (trip_id,))
         trip = cursor.fetchone()
-        
+
         if not trip:
             flash('Trip not found.', 'error')
         else:
             cursor.execute('DELETE FROM trips WHERE id = %s', (trip_id,))
             conn.commit()
             flash(f'Trip "{trip["trip_name"]}" deleted successfully.', 'success')
-        
-        return_connection(conn)
-        
+
     except Exception as e:
         flash(f'Error deleting trip: {str(e)}', 'error')
     
     return redirect(url_for('admin_trips'))
 
 @app.route('/admin/trips/<int:trip_id>/participants')
+@admin_required
 def admin_trip_participants(trip_id):
     """Manage trip participants"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
-    conn = get_db_connection()
-
-    
-    cursor = get_cursor(conn)
+    cursor = get_cursor(request_db())
     cursor.execute('SELECT * FROM trips WHERE id = %s', (trip_id,))
     trip = cursor.fetchone()
-    
+
     if not trip:
         flash('Trip not found.', 'error')
         return redirect(url_for('admin_trips'))
-    
-    # Get all participants
-    cursor.execute('SELECT * FROM participants ORDER BY full_name')
-    participants = cursor.fetchall()
-    
-    # Get current trip participants
-    current_participants = []
-    if trip['participants']:
-        participant_ids = json.loads(trip['participants'])
-        if participant_ids:
-            placeholders = ','.join('%s' * len(participant_ids))
-            current_participants = cursor.execute(
-                f'SELECT * FROM participants WHERE id IN ({placeholders})',
-                participant_ids
-            ).fetchall()
-    
-    return_connection(conn)
-    
-    return render_template('admin_trip_participants.html', 
-                         trip=trip, participants=participants, 
-                         current_participants=current_participants)
+
+    cursor.execute('SELECT participant_id FROM trip_participants WHERE trip_id = %s',
+                   (trip_id,))
+    current_ids = {row['participant_id'] for row in cursor.fetchall()}
+
+    # Get all participants once; the roster overlaps this result set,
+    # so the old IN (...) query was pure duplicate traffic
+    participants = _all_participants(cursor)
+
+    current_participants = [p for p in participants if p['id'] in current_ids]
+
+    return render_template('admin_trip_participants.html',
+                         trip=trip, participants=participants,
+                         current_participants=current_participants,
+                         current_ids=current_ids)
 
 @app.route('/admin/trips/<int:trip_id>/participants', methods=['POST'])
+@admin_required
 def admin_update_trip_participants(trip_id):
     """Update trip participants"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
     try:
         selected_participants = request.form.getlist('participants')
         participant_ids = [int(pid) for pid in selected_participants if pid.isdigit()]
-        
-        conn = get_db_connection()
 
-        
+        conn = request_db()
         cursor = get_cursor(conn)
-        cursor.execute(
-            'UPDATE trips SET participants = %s, updated_date = datetime("now") WHERE id = %s',
-            (json.dumps(participant_ids), trip_id)
-        )
+        cursor.execute('DELETE FROM trip_participants WHERE trip_id = %s', (trip_id,))
+        if participant_ids:
+            cursor.execute('''
+                INSERT INTO trip_participants (trip_id, participant_id)
+                SELECT %s, unnest(%s::int[])
+            ''', (trip_id, participant_ids))
+        cursor.execute('UPDATE trips SET updated_date = NOW() WHERE id = %s', (trip_id,))
         conn.commit()
-        return_connection(conn)
-        
+
         flash('Trip participants updated successfully!', 'success')
         
     except Exception as e:
@@ -1631,307 +1881,333 @@ def admin_update_trip_participants(trip_id):
     return redirect(url_for('admin_trip_participants', trip_id=trip_id))
 
 # Export Routes
+class _CsvEcho:
+    """File-like shim whose write() hands each CSV line straight back as
+    UTF-8 bytes, so csv.writer can feed a streaming response without
+    buffering and the server never re-encodes the body."""
+    def write(self, value):
+        return value.encode('utf-8')
+
 @app.route('/admin/export/registration-data')
+@admin_required
 def export_registration_data():
     """Export registration data as CSV"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
+    conn = None
     try:
+        # Checked out manually, not via request_db(): teardown would
+        # return a request-scoped connection before the response body is
+        # iterated, invalidating the named cursor mid-download
         conn = get_db_connection()
-
-        cursor = get_cursor(conn)
-        cursor.execute('SELECT * FROM participants ORDER BY registration_time DESC')
-        participants = cursor.fetchall()
-        return_connection(conn)
-        
-        # Create CSV output
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        headers = [
-            'ID', 'Full Name', 'Email', 'Phone Number', 'Address', 'Emergency Contact',
-            'Traveled With', 'Accommodation', 'Other Accommodation', 'Participation Days',
-            'Eating at Expedition', 'Roppel Trips', 'CRF Compass Agreement', 'Skills',
-            'Have Instruments', 'Instrument Details', 'Group Gear', 'Group Gear Other Details',
-            'Additional Info', 'Registration Time', 'Waiver Acknowledged', 'Waiver Timestamp'
-        ]
-        writer.writerow(headers)
-        
-        # Write data rows
-        for participant in participants:
-            # Parse JSON fields for better readability
-            participation_days = json.loads(participant['participation_days']) if participant['participation_days'] else []
-            skills = json.loads(participant['skills']) if participant['skills'] else []
-            group_gear = json.loads(participant['group_gear']) if participant['group_gear'] else []
-            
-            row = [
-                participant['id'],
-                participant['full_name'],
-                participant['email'],
-                participant['phone_number'],
-                participant['address'],
-                participant['emergency_contact'],
-                participant['traveled_with'],
-                participant['accommodation'],
-                participant['other_accommodation'],
-                ', '.join(participation_days) if participation_days else '',
-                'Yes' if participant['eating_at_expedition'] else 'No',
-                participant['roppel_trips'],
-                'Yes' if participant['crf_compass_agreement'] else 'No',
-                ', '.join(skills) if skills else '',
-                'Yes' if participant['have_instruments'] else 'No',
-                participant['instruments_details'],
-                ', '.join(group_gear) if group_gear else '',
-                participant['group_gear_other_details'],
-                participant['additional_info'],
-                participant['registration_time'],
-                'Yes' if participant.get('waiver_acknowledged') else 'No',
-                participant.get('waiver_acknowledged_timestamp', '')
-            ]
-            writer.writerow(row)
-        
-        # Create response
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=CKKC_Expedition_Registration_Data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        
-        return response
-        
+        # Server-side cursor: rows are fetched in batches as the CSV
+        # streams out, so memory stays flat no matter the roster size
+        cursor = conn.cursor(name='export_registration',
+                             cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor.itersize = 1000
+        # Comma-join the JSONB list columns in the database rather than
+        # decoding and joining them per row in Python
+        cursor.execute('''
+            SELECT id, full_name, email, phone_number, address, emergency_contact,
+                   traveled_with, accommodation, other_accommodation,
+                   array_to_string(ARRAY(SELECT jsonb_array_elements_text(participation_days)), ', ') AS participation_days_csv,
+                   eating_at_expedition, roppel_trips, crf_compass_agreement,
+                   array_to_string(ARRAY(SELECT jsonb_array_elements_text(skills)), ', ') AS skills_csv,
+                   have_instruments, instruments_details,
+                   array_to_string(ARRAY(SELECT jsonb_array_elements_text(group_gear)), ', ') AS group_gear_csv,
+                   group_gear_other_details, additional_info, registration_time,
+                   waiver_acknowledged, waiver_acknowledged_timestamp
+            FROM participants
+            ORDER BY registration_time DESC
+        ''')
     except Exception as e:
+        if conn:
+            return_connection(conn, error=True)
         flash(f'Error exporting registration data: {str(e)}', 'error')
         return redirect(url_for('admin_dashboard'))
 
+    writer = csv.writer(_CsvEcho())
+
+    headers = [
+        'ID', 'Full Name', 'Email', 'Phone Number', 'Address', 'Emergency Contact',
+        'Traveled With', 'Accommodation', 'Other Accommodation', 'Participation Days',
+        'Eating at Expedition', 'Roppel Trips', 'CRF Compass Agreement', 'Skills',
+        'Have Instruments', 'Instrument Details', 'Group Gear', 'Group Gear Other Details',
+        'Additional Info', 'Registration Time', 'Waiver Acknowledged', 'Waiver Timestamp'
+    ]
+
+    def generate(conn=conn, cursor=cursor):
+        try:
+            yield writer.writerow(headers)
+            for participant in cursor:
+                yield writer.writerow([
+                    participant['id'],
+                    participant['full_name'],
+                    participant['email'],
+                    participant['phone_number'],
+                    participant['address'],
+                    participant['emergency_contact'],
+                    participant['traveled_with'],
+                    participant['accommodation'],
+                    participant['other_accommodation'],
+                    participant['participation_days_csv'],
+                    'Yes' if participant['eating_at_expedition'] else 'No',
+                    participant['roppel_trips'],
+                    'Yes' if participant['crf_compass_agreement'] else 'No',
+                    participant['skills_csv'],
+                    'Yes' if participant['have_instruments'] else 'No',
+                    participant['instruments_details'],
+                    participant['group_gear_csv'],
+                    participant['group_gear_other_details'],
+                    participant['additional_info'],
+                    participant['registration_time'],
+                    'Yes' if participant['waiver_acknowledged'] else 'No',
+                    participant['waiver_acknowledged_timestamp'] or ''
+                ])
+        finally:
+            return_connection(conn)
+
+    filename = f'CKKC_Expedition_Registration_Data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
 @app.route('/admin/export/cave-survey-data')
+@admin_required
 def export_cave_survey_data():
     """Export cave survey data as CSV"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
+    conn = None
     try:
-        conn = get_cave_survey_db_connection()
-        cursor.execute('SELECT * FROM shots ORDER BY survey_id, page_id, sequence_in_page')
-        shots = cursor.fetchall()
-        return_connection(conn)
-        
-        # Create CSV output
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        headers = [
-            'Shot ID', 'Survey ID', 'Page ID', 'Sequence in Page', 'Station From', 'Station To',
-            'Distance', 'FS Azimuth (deg)', 'BS Azimuth (deg)', 'FS Incline (deg)', 'BS Incline (deg)',
-            'LRUD Left', 'LRUD Right', 'LRUD Up', 'LRUD Down', 'Note', 'Azimuth Variance (deg)',
-            'Incline Variance (deg)', 'Running Raw Distance', 'LRUD For Station', 'QA Flag'
-        ]
-        writer.writerow(headers)
-        
-        # Write data rows
-        for shot in shots:
-            row = [
-                shot['shot_id'],
-                shot['survey_id'],
-                shot['page_id'],
-                shot['sequence_in_page'],
-                shot['station_from'],
-                shot['station_to'],
-                shot['distance'],
-                shot['fs_azimuth_deg'],
-                shot['bs_azimuth_deg'],
-                shot['fs_incline_deg'],
-                shot['bs_incline_deg'],
-                shot['lrud_left'],
-                shot['lrud_right'],
-                shot['lrud_up'],
-                shot['lrud_down'],
-                shot['note'],
-                shot['azimuth_variance_deg'],
-                shot['incline_variance_deg'],
-                shot['running_raw_distance'],
-                shot['lrud_for_station'],
-                shot['qa_flag']
-            ]
-            writer.writerow(row)
-        
-        # Create response
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=CKKC_Cave_Survey_Data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        
-        return response
-        
+        conn = get_db_connection()
+        cursor = conn.cursor(name='export_shots',
+                             cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor.itersize = 1000
+        cursor.execute('''
+            SELECT shot_id, survey_id, page_id, sequence_in_page, station_from,
+                   station_to, distance, fs_azimuth_deg, bs_azimuth_deg,
+                   fs_incline_deg, bs_incline_deg, lrud_left, lrud_right,
+                   lrud_up, lrud_down, note, azimuth_variance_deg,
+                   incline_variance_deg, running_raw_distance, lrud_for_station,
+                   qa_flag
+            FROM shots
+            ORDER BY survey_id, page_id, sequence_in_page
+        ''')
     except Exception as e:
+        if conn:
+            return_connection(conn, error=True)
         flash(f'Error exporting cave survey data: {str(e)}', 'error')
         return redirect(url_for('admin_dashboard'))
 
+    writer = csv.writer(_CsvEcho())
+
+    headers = [
+        'Shot ID', 'Survey ID', 'Page ID', 'Sequence in Page', 'Station From', 'Station To',
+        'Distance', 'FS Azimuth (deg)', 'BS Azimuth (deg)', 'FS Incline (deg)', 'BS Incline (deg)',
+        'LRUD Left', 'LRUD Right', 'LRUD Up', 'LRUD Down', 'Note', 'Azimuth Variance (deg)',
+        'Incline Variance (deg)', 'Running Raw Distance', 'LRUD For Station', 'QA Flag'
+    ]
+
+    def generate(conn=conn, cursor=cursor):
+        try:
+            yield writer.writerow(headers)
+            for shot in cursor:
+                yield writer.writerow([
+                    shot['shot_id'],
+                    shot['survey_id'],
+                    shot['page_id'],
+                    shot['sequence_in_page'],
+                    shot['station_from'],
+                    shot['station_to'],
+                    shot['distance'],
+                    shot['fs_azimuth_deg'],
+                    shot['bs_azimuth_deg'],
+                    shot['fs_incline_deg'],
+                    shot['bs_incline_deg'],
+                    shot['lrud_left'],
+                    shot['lrud_right'],
+                    shot['lrud_up'],
+                    shot['lrud_down'],
+                    shot['note'],
+                    shot['azimuth_variance_deg'],
+                    shot['incline_variance_deg'],
+                    shot['running_raw_distance'],
+                    shot['lrud_for_station'],
+                    shot['qa_flag']
+                ])
+        finally:
+            return_connection(conn)
+
+    filename = f'CKKC_Cave_Survey_Data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
 @app.route('/admin/export/trip-data')
+@admin_required
 def export_trip_data():
     """Export trip data as CSV"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-
+    conn = None
     try:
         conn = get_db_connection()
+        cursor = conn.cursor(name='export_trips',
+                             cursor_factory=psycopg2.extras.RealDictCursor)
+        cursor.itersize = 1000
+        # trips stores its skill/equipment lists as JSON text, so cast
+        # before unpacking; rosters come from the link table by name
+        cursor.execute('''
+            SELECT t.id, t.trip_name, COALESCE(t.cave_name, '') AS cave_name,
+                   t.trip_date, COALESCE(t.entry_time, '') AS entry_time,
+                   COALESCE(t.exit_time, '') AS exit_time,
+                   COALESCE(t.objective, '') AS objective,
+                   COALESCE(t.route_description, '') AS route_description,
+                   COALESCE(t.hazards, '') AS hazards,
+                   COALESCE(t.leader_name, '') AS leader_name,
+                   COALESCE((SELECT string_agg(p.full_name, ', ' ORDER BY p.full_name)
+                             FROM trip_participants tp
+                             JOIN participants p ON p.id = tp.participant_id
+                             WHERE tp.trip_id = t.id), '') AS participants_csv,
+                   array_to_string(ARRAY(SELECT jsonb_array_elements_text(t.required_skills::jsonb)), ', ') AS required_skills_csv,
+                   array_to_string(ARRAY(SELECT jsonb_array_elements_text(t.required_equipment::jsonb)), ', ') AS required_equipment_csv,
+                   t.max_participants, COALESCE(t.difficulty_level, '') AS difficulty_level,
+                   COALESCE(t.status, '') AS status, COALESCE(t.notes, '') AS notes,
+                   t.created_date, t.updated_date
+            FROM trips t
+            ORDER BY t.trip_date DESC
+        ''')
+    except Exception as e:
+        if conn:
+            return_connection(conn, error=True)
+        flash(f'Error exporting trip data: {str(e)}', 'error')
+        return redirect(url_for('admin_dashboard'))
 
-        cursor = get_cursor(conn)
-        cursor.execute('SELECT * FROM trips ORDER BY trip_date DESC')
-        trips = cursor.fetchall()
-        return_connection(conn)
-
-        # Create CSV output
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write header
-        headers = [
-            'ID', 'Trip Name', 'Cave Name', 'Trip Date', 'Entry Time', 'Exit Time',
-            'Objective', 'Route Description', 'Hazards', 'Leader Name', 'Participants',
-            'Required Skills', 'Required Equipment', 'Max Participants', 'Difficulty Level',
-            'Status', 'Notes', 'Created Date', 'Updated Date'
-        ]
-        writer.writerow(headers)
-
-        # Write data rows
-        for trip in trips:
-            # Parse JSON fields for better readability
-            participants = json.loads(trip['participants']) if trip['participants'] else []
-            required_skills = json.loads(trip['required_skills']) if trip['required_skills'] else []
-            required_equipment = json.loads(trip['required_equipment']) if trip['required_equipment'] else []
-
-            row = [
-                trip['id'],
-                trip['trip_name'],
-                trip['cave_name'] or '',
-                trip['trip_date'],
-                trip['entry_time'] or '',
-                trip['exit_time'] or '',
-                trip['objective'] or '',
-                trip['route_description'] or '',
-                trip['hazards'] or '',
-                trip['leader_name'] or '',
-                ', '.join(participants) if participants else '',
-                ', '.join(required_skills) if required_skills else '',
-                ', '.join(required_equipment) if required_equipment else '',
-                trip['max_participants'] or '',
-                trip['difficulty_level'] or '',
-                trip['status'] or '',
-                trip['notes'] or '',
-                trip['created_date'] or '',
-                trip['updated_date'] or ''
-            ]
-            writer.writerow(row)
+    writer = csv.writer(_CsvEcho())
 
-        # Create response
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=CKKC_Trip_Data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    headers = [
+        'ID', 'Trip Name', 'Cave Name', 'Trip Date', 'Entry Time', 'Exit Time',
+        'Objective', 'Route Description', 'Hazards', 'Leader Name', 'Participants',
+        'Required Skills', 'Required Equipment', 'Max Participants', 'Difficulty Level',
+        'Status', 'Notes', 'Created Date', 'Updated Date'
+    ]
 
-        return response
+    def generate(conn=conn, cursor=cursor):
+        try:
+            yield writer.writerow(headers)
+            for trip in cursor:
+                yield writer.writerow([
+                    trip['id'],
+                    trip['trip_name'],
+                    trip['cave_name'],
+                    trip['trip_date'],
+                    trip['entry_time'],
+                    trip['exit_time'],
+                    trip['objective'],
+                    trip['route_description'],
+                    trip['hazards'],
+                    trip['leader_name'],
+                    trip['participants_csv'],
+                    trip['required_skills_csv'],
+                    trip['required_equipment_csv'],
+                    trip['max_participants'] or '',
+                    trip['difficulty_level'],
+                    trip['status'],
+                    trip['notes'],
+                    trip['created_date'] or '',
+                    trip['updated_date'] or ''
+                ])
+        finally:
+            return_connection(conn)
 
-    except Exception as e:
-        flash(f'Error exporting trip data: {str(e)}', 'error')
-        return redirect(url_for('admin_dashboard'))
+    filename = f'CKKC_Trip_Data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
 @app.route('/admin/backup-databases')
+@admin_required
 def backup_databases():
-    """Create backup of both databases and return as ZIP file"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
+    """Create a pg_dump backup of the database and return it as a ZIP file"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
     try:
-        import tempfile
-        
-        # Create timestamp for backup
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Create temporary directory for backup files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create backup directory structure
-            backup_dir = os.path.join(temp_dir, f"CKKC_Database_Backup_{timestamp}")
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            backup_files = []
-            
-            # Backup registration database
-            if os.path.exists(DATABASE):
-                backup_reg_path = os.path.join(backup_dir, f"expedition_registration_{timestamp}.db")
-                shutil.copy2(DATABASE, backup_reg_path)
-                backup_files.append(("Registration Database", os.path.basename(backup_reg_path)))
-            
-            # Backup cave survey database
-            if os.path.exists(CAVE_SURVEY_DATABASE):
-                backup_survey_path = os.path.join(backup_dir, f"cave_survey_{timestamp}.db")
-                shutil.copy2(CAVE_SURVEY_DATABASE, backup_survey_path)
-                backup_files.append(("Cave Survey Database", os.path.basename(backup_survey_path)))
-            
-            # Create README file with backup information
-            readme_path = os.path.join(backup_dir, "README.txt")
-            with open(readme_path, 'w') as readme_file:
-                readme_file.write(f"""CKKC October 2025 Expedition Database Backup
+        # Custom-format dump with pg_dump's own compression; the dump
+        # streams straight into the ZIP entry so it is never buffered
+        # twice. stderr spools to a temp file rather than a pipe: we only
+        # look at it after stdout is drained, and a chatty pg_dump could
+        # fill a pipe buffer and deadlock against us
+        stderr_spool = tempfile.TemporaryFile()
+        proc = subprocess.Popen(
+            ['pg_dump', '--format=custom', '--compress=9', DATABASE_URL],
+            stdout=subprocess.PIPE, stderr=stderr_spool)
+
+        backup_name = f"CKKC_Database_Backup_{timestamp}"
+        zip_buffer = io.BytesIO()
+        with stderr_spool, zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            with zip_file.open(f"{backup_name}/expedition_{timestamp}.dump", 'w') as writer:
+                shutil.copyfileobj(proc.stdout, writer, length=1 << 20)
+            if proc.wait() != 0:
+                stderr_spool.seek(0)
+                stderr = stderr_spool.read()
+                raise RuntimeError(stderr.decode(errors='replace').strip() or 'pg_dump failed')
+
+            zip_file.writestr(f"{backup_name}/README.txt", f"""CKKC October 2025 Expedition Database Backup
 Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
-This backup contains the following database files:
+This backup contains:
+
+- expedition_{timestamp}.dump: full PostgreSQL dump (pg_dump custom format)
 
-""")
-                for db_type, filename in backup_files:
-                    readme_file.write(f"- {filename}: {db_type}\n")
-                
-                readme_file.write(f"""
 Backup Information:
 - Backup created automatically by the Expedition Management System
-- These are SQLite database files that can be restored by replacing the original files
-- To restore: Copy the database files back to the 'database/' directory in your expedition tool
-- Original filenames: expedition.db (registration), cave_survey.db (survey data)
-
-Database Schema:
-- Registration Database: Contains participant registration data, trip assignments, and expedition details
-- Cave Survey Database: Contains cave survey measurements, shot data, and cartographic information
+- To restore: pg_restore --clean --if-exists -d <database-url> expedition_{timestamp}.dump
+- The dump covers registration data, trips, and all cave survey tables
 
 For technical support, contact the CKKC expedition coordinators.
 """)
-            
-            # Create ZIP file in memory
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                # Add all files in the backup directory to the ZIP
-                for root, dirs, files in os.walk(backup_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        zip_file.write(file_path, arcname)
-            
-            zip_buffer.seek(0)
-            
-            # Create response
-            response = make_response(zip_buffer.getvalue())
-            response.headers['Content-Type'] = 'application/zip'
-            response.headers['Content-Disposition'] = f'attachment; filename=CKKC_Database_Backup_{timestamp}.zip'
-            
-            flash(f'Database backup created successfully! Downloaded: CKKC_Database_Backup_{timestamp}.zip', 'success')
-            return response
-            
+
+        zip_buffer.seek(0)
+
+        # Create response
+        response = make_response(zip_buffer.getvalue())
+        response.headers['Content-Type'] = 'application/zip'
+        response.headers['Content-Disposition'] = f'attachment; filename={backup_name}.zip'
+
+        flash(f'Database backup created successfully! Downloaded: {backup_name}.zip', 'success')
+        return response
+
     except Exception as e:
         flash(f'Error creating database backup: {str(e)}', 'error')
         return redirect(url_for('admin_dashboard'))
 
+# Settings change only through the two admin write endpoints below, so
+# the page can serve the last fetch until one of them clears it
+_settings_cache = None
+
+# Boolean settings rendered as checkboxes; absent from the form means
+# unchecked, which must be stored as 'false' rather than skipped
+_CHECKBOX_KEYS = frozenset({
+    'registration_open', 'auto_calculate_variance',
+    'require_leader_approval', 'emergency_contact_required',
+})
+
 @app.route('/admin/settings')
+@admin_required
 def admin_settings():
     """System settings page"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
+    global _settings_cache
     try:
-        conn = get_db_connection()
-
-        cursor = get_cursor(conn)
-        settings = cursor.execute('''
-            SELECT key, value, description, category 
-            FROM settings 
-            ORDER BY category, key
-        ''').fetchall()
-        return_connection(conn)
+        if _settings_cache is None:
+            cursor = get_cursor(request_db())
+            cursor.execute('''
+                SELECT key, value, description, category
+                FROM settings
+                ORDER BY category, key
+            ''')
+            _settings_cache = cursor.fetchall()
+        settings = _settings_cache
         
         # Group settings by category
         settings_by_category = {}
@@ -1948,44 +2224,33 @@ def admin_settings():
         return redirect(url_for('admin_dashboard'))
 
 @app.route('/admin/settings/update', methods=['POST'])
+@admin_required
 def update_settings():
     """Update system settings"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
     try:
-        conn = get_db_connection()
-
+        conn = request_db()
         cursor = get_cursor(conn)
-        
-        # Get all settings keys
-        cursor.execute('SELECT key FROM settings')
-        settings_keys = cursor.fetchall()
-        settings_keys = [row['key'] for row in settings_keys]
-        
-        # Update each setting
-        updated_count = 0
-        for key in settings_keys:
-            if key in request.form:
-                new_value = request.form[key].strip()
-                
-                # Handle checkbox values (convert to string boolean)
-                if key in ['registration_open', 'auto_calculate_variance', 'require_leader_approval', 'emergency_contact_required']:
-                    new_value = 'true' if new_value else 'false'
-                elif key not in request.form and key in ['registration_open', 'auto_calculate_variance', 'require_leader_approval', 'emergency_contact_required']:
-                    new_value = 'false'
-                
-                # Update the setting
-                cursor.execute('''
-                    UPDATE settings 
-                    SET value = %s, updated_date = NOW()
-                    WHERE key = %s
-                ''', (new_value, key))
-                updated_count += 1
-        
+
+        # Collect every change, then ship them as one batch. Checkboxes
+        # are handled off the key set: an unchecked box never shows up in
+        # the form at all, so it has to default to 'false' explicitly.
+        payload = [('true' if request.form.get(key) else 'false', key)
+                   for key in _CHECKBOX_KEYS]
+        payload.extend((request.form[key].strip(), key)
+                       for key in request.form if key not in _CHECKBOX_KEYS)
+
+        if payload:
+            cursor.executemany('''
+                UPDATE settings
+                SET value = %s, updated_date = NOW()
+                WHERE key = %s
+            ''', payload)
+        updated_count = len(payload)
+
         conn.commit()
-        return_connection(conn)
-        
+        global _settings_cache
+        _settings_cache = None
+
         flash(f'Settings updated successfully! {updated_count} settings saved.', 'success')
         
     except Exception as e:
@@ -1994,16 +2259,13 @@ def update_settings():
     return redirect(url_for('admin_settings'))
 
 @app.route('/admin/settings/reset', methods=['POST'])
+@admin_required
 def reset_settings():
     """Reset settings to default values"""
-    if not session.get('admin_authenticated'):
-        return redirect(url_for('admin_login'))
-    
     try:
-        conn = get_db_connection()
-
+        conn = request_db()
         cursor = get_cursor(conn)
-        
+
         # Reset to default values
         default_settings = [
             ('expedition_name', 'CKKC October 2025 Expedition'),
@@ -2020,16 +2282,16 @@ def reset_settings():
             ('emergency_contact_required', 'true')
         ]
         
-        for key, value in default_settings:
-            cursor.execute('''
-                UPDATE settings 
-                SET value = %s, updated_date = NOW()
-                WHERE key = %s
-            ''', (value, key))
-        
+        cursor.executemany('''
+            UPDATE settings
+            SET value = %s, updated_date = NOW()
+            WHERE key = %s
+        ''', [(value, key) for key, value in default_settings])
+
         conn.commit()
-        return_connection(conn)
-        
+        global _settings_cache
+        _settings_cache = None
+
         flash('Settings have been reset to default values.', 'success')
         
     except Exception as e:
@@ -2037,16 +2299,22 @@ def reset_settings():
     
     return redirect(url_for('admin_settings'))
 
+# Load balancers poll /health every few seconds; remember the last good
+# probe briefly so most polls answer without touching the pool
+_HEALTH_TTL = 2.0
+_health_last_ok = 0.0
+
 @app.route('/health')
 def health_check():
     """Health check endpoint for monitoring and load balancers"""
-    conn = None
+    global _health_last_ok
     try:
-        # Test database connection
-        conn = get_db_connection()
-        cursor = get_cursor(conn)
-        cursor.execute('SELECT 1')
-        cursor.fetchone()
+        if time.monotonic() - _health_last_ok >= _HEALTH_TTL:
+            # Test database connection
+            cursor = get_cursor(request_db())
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            _health_last_ok = time.monotonic()
 
         return jsonify({
             'status': 'healthy',
@@ -2055,7 +2323,8 @@ def health_check():
         }), 200
     except Exception as e:
         app.logger.error(f"Health check failed: {e}")
-        if conn:
+        conn = g.pop('db_conn', None)
+        if conn is not None:
             return_connection(conn, error=True)
         return jsonify({
             'status': 'unhealthy',
@@ -2063,9 +2332,6 @@ def health_check():
             'error': str(e),
             'timestamp': datetime.now().isoformat()
         }), 503
-    finally:
-        if conn:
-            return_connection(conn)
 
 if __name__ == '__main__':
     init_connection_pool()
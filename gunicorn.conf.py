@@ -0,0 +1,11 @@
+"""
+Gunicorn configuration for production deployment
+Loaded automatically from the working directory by gunicorn
+"""
+
+def post_fork(server, worker):
+    # psycopg2 pools are not fork-safe: a pool built in the master would
+    # hand every worker the same inherited sockets. Build one per worker
+    # instead, after the fork.
+    from app import init_connection_pool
+    init_connection_pool()
@@ -19,14 +19,14 @@ CREATE TABLE IF NOT EXISTS participants (
     traveled_with TEXT,
     accommodation TEXT NOT NULL,
     other_accommodation TEXT,
-    participation_days TEXT,  -- JSON array of selected days
+    participation_days JSONB,  -- JSON array of selected days
     eating_at_expedition BOOLEAN DEFAULT FALSE,
     roppel_trips TEXT,
     crf_compass_agreement BOOLEAN DEFAULT FALSE,
-    skills TEXT,  -- JSON array of skills
+    skills JSONB,  -- JSON array of skills
     have_instruments BOOLEAN DEFAULT FALSE,
     instruments_details TEXT,
-    group_gear TEXT,  -- JSON array of gear
+    group_gear JSONB,  -- JSON array of gear
     group_gear_other_details TEXT,
     additional_info TEXT,
     waiver_acknowledged BOOLEAN DEFAULT TRUE,
@@ -34,6 +34,12 @@ CREATE TABLE IF NOT EXISTS participants (
     registration_time TIMESTAMP DEFAULT NOW()
 );
 
+-- Migrate pre-existing databases where the JSON array columns were TEXT
+ALTER TABLE participants
+    ALTER COLUMN participation_days TYPE JSONB USING participation_days::jsonb,
+    ALTER COLUMN skills TYPE JSONB USING skills::jsonb,
+    ALTER COLUMN group_gear TYPE JSONB USING group_gear::jsonb;
+
 -- Trips table
 CREATE TABLE IF NOT EXISTS trips (
     id SERIAL PRIMARY KEY,
@@ -41,7 +47,6 @@ CREATE TABLE IF NOT EXISTS trips (
     trip_date DATE,
     objective TEXT,
     leader_name TEXT,
-    participants TEXT,  -- JSON array of participant IDs
     status TEXT DEFAULT 'planned',
     cave_name TEXT,
     entry_time TEXT,
@@ -57,6 +62,30 @@ CREATE TABLE IF NOT EXISTS trips (
     updated_date TIMESTAMP DEFAULT NOW()
 );
 
+-- Trip rosters live in a link table so membership lookups use the index
+-- and roster updates don't rewrite a JSON blob on the trip row
+CREATE TABLE IF NOT EXISTS trip_participants (
+    trip_id INTEGER REFERENCES trips(id) ON DELETE CASCADE,
+    participant_id INTEGER REFERENCES participants(id) ON DELETE CASCADE,
+    PRIMARY KEY (trip_id, participant_id)
+);
+
+-- Migrate pre-existing databases where the roster was a JSON column
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'trips' AND column_name = 'participants') THEN
+        INSERT INTO trip_participants (trip_id, participant_id)
+        SELECT t.id, p.id
+        FROM trips t
+        CROSS JOIN LATERAL jsonb_array_elements_text(t.participants::jsonb) AS e(value)
+        JOIN participants p ON p.id = e.value::int
+        WHERE t.participants IS NOT NULL AND t.participants <> ''
+        ON CONFLICT DO NOTHING;
+        ALTER TABLE trips DROP COLUMN participants;
+    END IF;
+END $$;
+
 -- ============================================
 -- CAVE SURVEY DATABASE
 -- ============================================
@@ -211,14 +240,21 @@ CREATE TABLE IF NOT EXISTS survey_header (
     crf_compass_course INTEGER DEFAULT 0,
     calibration_notes TEXT,
     additional_equipment TEXT,
-    survey_shots_json TEXT,
+    survey_shots_json JSONB,
     raw_data TEXT,
     instruments_crf_course INTEGER DEFAULT 0,
     data_accuracy INTEGER DEFAULT 0,
     fsb_number TEXT,
-    created_date TIMESTAMP DEFAULT NOW()
+    created_date TIMESTAMP DEFAULT NOW(),
+    updated_date TIMESTAMP DEFAULT NOW()
 );
 
+-- Migrate pre-existing databases where the shots array was stored as TEXT
+ALTER TABLE survey_header
+    ALTER COLUMN survey_shots_json TYPE JSONB USING survey_shots_json::jsonb;
+ALTER TABLE survey_header
+    ADD COLUMN IF NOT EXISTS updated_date TIMESTAMP DEFAULT NOW();
+
 -- Settings table
 CREATE TABLE IF NOT EXISTS settings (
     key TEXT PRIMARY KEY,
@@ -232,10 +268,18 @@ CREATE TABLE IF NOT EXISTS settings (
 -- INDEXES
 -- ============================================
 
+CREATE UNIQUE INDEX IF NOT EXISTS ux_participants_email ON participants (lower(email));
+CREATE INDEX IF NOT EXISTS ix_participants_regtime_desc ON participants (registration_time DESC);
+CREATE INDEX IF NOT EXISTS ix_trips_date ON trips (trip_date ASC, created_date ASC);
 CREATE INDEX IF NOT EXISTS idx_shots_survey_from ON shots(survey_id, station_from);
 CREATE INDEX IF NOT EXISTS idx_shots_survey_to ON shots(survey_id, station_to);
 CREATE INDEX IF NOT EXISTS idx_shots_page_seq ON shots(page_id, sequence_in_page);
 CREATE INDEX IF NOT EXISTS idx_survey_team_role ON survey_team(survey_id, role);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_people_full_name ON people (full_name);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_caves_name_loc ON caves (name, location_text);
+CREATE INDEX IF NOT EXISTS ix_shots_survey_seq ON shots (survey_id, sequence_in_page);
+-- Presorts the full-export scan (ORDER BY survey_id, page_id, sequence_in_page)
+CREATE INDEX IF NOT EXISTS idx_shots_survey_page_seq ON shots (survey_id, page_id, sequence_in_page);
 
 -- ============================================
 -- VIEWS
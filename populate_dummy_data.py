@@ -4,357 +4,197 @@ Populate CKKC Expedition Database with Dummy Demo Data
 Uses fictional animation characters for demonstration purposes
 """
 
+import csv
+import io
 import os
+import sys
 import psycopg2
 import psycopg2.extras
+from psycopg2.extras import execute_values
 from datetime import datetime, timedelta
 import json
 import random
 
-# Database connection
+# Database connection: parse the DSN once at import and tag the session
+# so the run is identifiable in pg_stat_activity
 DATABASE_URL = os.getenv('DATABASE_URL', 'postgresql://localhost/expedition_db')
+_CONN_KWARGS = dict(psycopg2.extensions.parse_dsn(DATABASE_URL),
+                    application_name='populate_dummy')
 
 def get_connection():
     """Get database connection"""
-    return psycopg2.connect(DATABASE_URL)
+    return psycopg2.connect(**_CONN_KWARGS)
+
+# Status lines are queued and written in one go: under containerized
+# logging every print() is a separate write() syscall otherwise
+_log = []
+
+def log(message=''):
+    _log.append(message)
+
+def flush_log():
+    if _log:
+        sys.stdout.write('\n'.join(_log) + '\n')
+        sys.stdout.flush()
+        _log.clear()
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_fixture(name):
+    """Load one of the JSON fixture files shipped next to this script"""
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return json.load(f)
+
+# Fixture lists repeat heavily (every tent camper shares ['tent'], most
+# trips share the same gear list); encode each distinct list once
+_json_cache = {}
+
+def dump_list(values):
+    key = tuple(values)
+    cached = _json_cache.get(key)
+    if cached is None:
+        cached = _json_cache[key] = json.dumps(values)
+    return cached
+
+# Column lists and SQL templates are module constants so repeated runs
+# (and tests importing these functions) reuse the same parsed strings
+PARTICIPANT_COLUMNS = (
+    'full_name', 'email', 'phone_number', 'address', 'emergency_contact',
+    'traveled_with', 'accommodation', 'other_accommodation',
+    'participation_days', 'eating_at_expedition', 'roppel_trips',
+    'crf_compass_agreement', 'skills', 'have_instruments',
+    'instruments_details', 'group_gear', 'group_gear_other_details',
+    'additional_info', 'waiver_acknowledged', 'waiver_acknowledged_timestamp',
+)
+
+TRIP_COLUMNS = (
+    'trip_name', 'trip_date', 'cave_name', 'objective', 'leader_name',
+    'entry_time', 'exit_time', 'route_description', 'hazards',
+    'required_skills', 'required_equipment', 'max_participants',
+    'difficulty_level', 'notes', 'status', 'created_date',
+)
+
+SQL_INS_ROSTER = 'INSERT INTO trip_participants (trip_id, participant_id) VALUES %s'
+SQL_INS_CAVES = 'INSERT INTO caves (name, location_text) VALUES %s RETURNING cave_id'
+SQL_INS_PEOPLE = 'INSERT INTO people (full_name) VALUES %s RETURNING person_id'
+
+SQL_INS_SURVEY = '''
+    INSERT INTO surveys
+    (cave_id, date, area_in_cave, objective, time_in, time_out, conditions,
+     survey_designation_raw, units_length, units_compass, units_clino)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    RETURNING survey_id
+'''
+
+SQL_INS_TEAM = '''
+    INSERT INTO survey_team (survey_id, person_id, display_name, role)
+    VALUES %s
+'''
+
+SQL_INS_SHOTS = '''
+    INSERT INTO shots
+    (survey_id, sequence_in_page, station_from, station_to, distance,
+     fs_azimuth_deg, bs_azimuth_deg, fs_incline_deg, bs_incline_deg,
+     lrud_left, lrud_right, lrud_up, lrud_down, note)
+    VALUES %s
+'''
+
+SQL_UPSERT_SETTING = '''
+    INSERT INTO settings (key, value, description, category, updated_date)
+    VALUES (%s, %s, %s, %s, NOW())
+    ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_date = NOW()
+'''
+
+def copy_rows(cursor, table, columns, rows):
+    """Bulk-load rows with COPY, the fastest path into Postgres"""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
 
 def clear_existing_data(conn):
     """Clear existing demo data"""
-    print("🧹 Clearing existing data...")
+    log("🧹 Clearing existing data...")
     cursor = conn.cursor()
 
-    # Delete in order respecting foreign keys
-    cursor.execute("DELETE FROM shots")
-    cursor.execute("DELETE FROM book_pages")
-    cursor.execute("DELETE FROM survey_notes")
-    cursor.execute("DELETE FROM survey_ties")
-    cursor.execute("DELETE FROM survey_instruments")
-    cursor.execute("DELETE FROM survey_team")
-    cursor.execute("DELETE FROM survey_series")
-    cursor.execute("DELETE FROM surveys")
-    cursor.execute("DELETE FROM survey_header")
-    cursor.execute("DELETE FROM trips")
-    cursor.execute("DELETE FROM participants")
-    cursor.execute("DELETE FROM people")
-    cursor.execute("DELETE FROM instruments")
-    cursor.execute("DELETE FROM caves")
-
-    conn.commit()
-    print("✓ Cleared existing data")
+    # TRUNCATE empties every table in one statement; CASCADE takes care
+    # of FK ordering and RESTART IDENTITY resets the serial sequences
+    cursor.execute("""
+        TRUNCATE shots, book_pages, survey_notes, survey_ties,
+                 survey_instruments, survey_team, survey_series, surveys,
+                 survey_header, trip_participants, trips, participants,
+                 people, instruments, caves
+        RESTART IDENTITY CASCADE
+    """)
+
+    log("✓ Cleared existing data")
 
 def populate_participants(conn):
     """Add fictional animation character participants"""
-    print("👥 Adding participants (fictional animation characters)...")
-
-    participants = [
-        {
-            'full_name': 'Shaggy Rogers',
-            'email': 'shaggy@mysteryinc.demo',
-            'phone': '555-0101',
-            'address': '123 Mystery Lane, Coolsville, OH',
-            'emergency_contact': 'Scooby-Doo (Dog): 555-0102',
-            'traveled_with': 'Scooby-Doo',
-            'accommodation': 'tent',
-            'participation_days': json.dumps(['2025-10-11', '2025-10-12', '2025-10-13']),
-            'eating_at_expedition': True,
-            'roppel_trips': 'Maybe interested in seeing the underground kitchen',
-            'crf_compass_agreement': True,
-            'skills': json.dumps(['vertical', 'sketching', 'photography']),
-            'have_instruments': False,
-            'group_gear': json.dumps(['tent', 'cooking_gear'])
-        },
-        {
-            'full_name': 'Scooby-Doo',
-            'email': 'scooby@mysteryinc.demo',
-            'phone': '555-0102',
-            'address': '123 Mystery Lane, Coolsville, OH',
-            'emergency_contact': 'Shaggy Rogers: 555-0101',
-            'traveled_with': 'Shaggy Rogers',
-            'accommodation': 'tent',
-            'participation_days': json.dumps(['2025-10-11', '2025-10-12']),
-            'eating_at_expedition': True,
-            'roppel_trips': 'Interested in Scooby Snacks Underground Tour',
-            'crf_compass_agreement': True,
-            'skills': json.dumps(['vertical', 'navigation']),
-            'have_instruments': False,
-            'group_gear': json.dumps(['tent'])
-        },
-        {
-            'full_name': 'Velma Dinkley',
-            'email': 'velma@mysteryinc.demo',
-            'phone': '555-0103',
-            'address': '456 Research Blvd, Coolsville, OH',
-            'emergency_contact': 'Daphne Blake: 555-0104',
-            'accommodation': 'cabin',
-            'participation_days': json.dumps(['2025-10-11', '2025-10-12', '2025-10-13', '2025-10-14']),
-            'eating_at_expedition': True,
-            'roppel_trips': 'Very interested in geological formations',
-            'crf_compass_agreement': True,
-            'skills': json.dumps(['surveying', 'sketching', 'navigation', 'vertical']),
-            'have_instruments': True,
-            'instruments_details': 'Brunton Compass, Suunto Clino',
-            'group_gear': json.dumps(['rope', 'survey_instruments'])
-        },
-        {
-            'full_name': 'Daphne Blake',
-            'email': 'daphne@mysteryinc.demo',
-            'phone': '555-0104',
-            'address': '789 Fashion Ave, Coolsville, OH',
-            'emergency_contact': 'Fred Jones: 555-0105',
-            'accommodation': 'cabin',
-            'participation_days': json.dumps(['2025-10-11', '2025-10-12', '2025-10-13']),
-            'eating_at_expedition': True,
-            'roppel_trips': 'Interested in photography opportunities',
-            'crf_compass_agreement': True,
-            'skills': json.dumps(['photography', 'vertical']),
-            'have_instruments': False,
-            'group_gear': json.dumps(['cooking_gear'])
-        },
-        {
-            'full_name': 'Fred Jones',
-            'email': 'fred@mysteryinc.demo',
-            'phone': '555-0105',
-            'address': '321 Leadership St, Coolsville, OH',
-            'emergency_contact': 'Velma Dinkley: 555-0103',
-            'accommodation': 'rv',
-            'participation_days': json.dumps(['2025-10-11', '2025-10-12', '2025-10-13', '2025-10-14', '2025-10-15']),
-            'eating_at_expedition': True,
-            'roppel_trips': 'Leading several trips',
-            'crf_compass_agreement': True,
-            'skills': json.dumps(['navigation', 'vertical', 'rigging', 'rescue']),
-            'have_instruments': True,
-            'instruments_details': 'Complete survey kit with laser rangefinder',
-            'group_gear': json.dumps(['rope', 'rigging_equipment', 'survey_instruments'])
-        },
-        {
-            'full_name': 'SpongeBob SquarePants',
-            'email': 'spongebob@bikinibottom.demo',
-            'phone': '555-0201',
-            'address': '124 Conch Street, Bikini Bottom',
-            'emergency_contact': 'Patrick Star: 555-0202',
-            'traveled_with': 'Patrick Star',
-            'accommodation': 'tent',
-            'participation_days': json.dumps(['2025-10-12', '2025-10-13']),
-            'eating_at_expedition': True,
-            'roppel_trips': 'Ready for underwater... I mean underground adventure!',
-            'crf_compass_agreement': True,
-            'skills': json.dumps(['vertical']),
-            'have_instruments': False,
-            'group_gear': json.dumps(['tent'])
-        },
-        {
-            'full_name': 'Patrick Star',
-            'email': 'patrick@bikinibottom.demo',
-            'phone': '555-0202',
-            'address': '120 Conch Street, Bikini Bottom',
-            'emergency_contact': 'SpongeBob SquarePants: 555-0201',
-            'traveled_with': 'SpongeBob SquarePants',
-            'accommodation': 'tent',
-            'participation_days': json.dumps(['2025-10-12', '2025-10-13']),
-            'eating_at_expedition': True,
-            'crf_compass_agreement': True,
-            'skills': json.dumps([]),
-            'have_instruments': False,
-            'group_gear': json.dumps(['tent'])
-        },
-        {
-            'full_name': 'Sandy Cheeks',
-            'email': 'sandy@bikinibottom.demo',
-            'phone': '555-0203',
-            'address': 'Treedome, Bikini Bottom',
-            'emergency_contact': 'SpongeBob SquarePants: 555-0201',
-            'accommodation': 'tent',
-            'participation_days': json.dumps(['2025-10-11', '2025-10-12', '2025-10-13', '2025-10-14']),
-            'eating_at_expedition': True,
-            'roppel_trips': 'Science expedition participant',
-            'crf_compass_agreement': True,
-            'skills': json.dumps(['surveying', 'vertical', 'rigging', 'navigation']),
-            'have_instruments': True,
-            'instruments_details': 'Scientific equipment and survey tools',
-            'group_gear': json.dumps(['rope', 'survey_instruments', 'scientific_equipment'])
-        },
-        {
-            'full_name': 'Finn the Human',
-            'email': 'finn@adventuretime.demo',
-            'phone': '555-0301',
-            'address': 'Tree Fort, Land of Ooo',
-            'emergency_contact': 'Jake the Dog: 555-0302',
-            'traveled_with': 'Jake the Dog',
-            'accommodation': 'tent',
-            'participation_days': json.dumps(['2025-10-13', '2025-10-14', '2025-10-15']),
-            'eating_at_expedition': True,
-            'roppel_trips': 'Mathematical cave adventures!',
-            'crf_compass_agreement': True,
-            'skills': json.dumps(['vertical', 'rigging', 'rescue']),
-            'have_instruments': False,
-            'group_gear': json.dumps(['rope', 'tent'])
-        },
-        {
-            'full_name': 'Jake the Dog',
-            'email': 'jake@adventuretime.demo',
-            'phone': '555-0302',
-            'address': 'Tree Fort, Land of Ooo',
-            'emergency_contact': 'Finn the Human: 555-0301',
-            'traveled_with': 'Finn the Human',
-            'accommodation': 'tent',
-            'participation_days': json.dumps(['2025-10-13', '2025-10-14', '2025-10-15']),
-            'eating_at_expedition': True,
-            'roppel_trips': 'Stretchy abilities useful for tight passages',
-            'crf_compass_agreement': True,
-            'skills': json.dumps(['navigation', 'vertical']),
-            'have_instruments': False,
-            'group_gear': json.dumps(['tent'])
-        }
-    ]
+    log("👥 Adding participants (fictional animation characters)...")
+
+    participants = load_fixture('participants.json')
 
     cursor = conn.cursor()
-    for p in participants:
-        cursor.execute('''
-            INSERT INTO participants
-            (full_name, email, phone_number, address, emergency_contact, traveled_with,
-             accommodation, other_accommodation, participation_days, eating_at_expedition,
-             roppel_trips, crf_compass_agreement, skills, have_instruments,
-             instruments_details, group_gear, group_gear_other_details, additional_info,
-             waiver_acknowledged, waiver_acknowledged_timestamp)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-        ''', (
-            p['full_name'], p['email'], p['phone'], p['address'],
-            p['emergency_contact'], p.get('traveled_with', ''),
-            p['accommodation'], p.get('other_accommodation', ''),
-            p['participation_days'], p['eating_at_expedition'],
-            p.get('roppel_trips', ''), p['crf_compass_agreement'],
-            p['skills'], p.get('have_instruments', False),
-            p.get('instruments_details', ''),
-            p.get('group_gear', '[]'), p.get('group_gear_other_details', ''),
-            p.get('additional_info', ''), True
-        ))
-
-    conn.commit()
-    print(f"✓ Added {len(participants)} participants")
+    now = datetime.now()
+    rows = [(
+        p['full_name'], p['email'], p['phone'], p['address'],
+        p['emergency_contact'], p.get('traveled_with', ''),
+        p['accommodation'], p.get('other_accommodation', ''),
+        dump_list(p['participation_days']), p['eating_at_expedition'],
+        p.get('roppel_trips', ''), p['crf_compass_agreement'],
+        dump_list(p['skills']), p.get('have_instruments', False),
+        p.get('instruments_details', ''),
+        dump_list(p.get('group_gear', [])), p.get('group_gear_other_details', ''),
+        p.get('additional_info', ''), True, now
+    ) for p in participants]
+
+    # COPY skips per-row parse/plan entirely; the JSON columns are
+    # already text and cast on the way in
+    copy_rows(cursor, 'participants', PARTICIPANT_COLUMNS, rows)
+
+    log(f"✓ Added {len(participants)} participants")
 
 def populate_trips(conn):
     """Add sample cave trips"""
-    print("🏔️ Adding cave trips...")
-
-    base_date = datetime(2025, 10, 11)
-
-    trips = [
-        {
-            'trip_name': 'Mystery Machine Cave Tour',
-            'trip_date': base_date,
-            'cave_name': 'Mammoth Cave',
-            'objective': 'Survey new passages in Historic Section',
-            'leader_name': 'Fred Jones',
-            'participants': json.dumps(['Fred Jones', 'Velma Dinkley', 'Daphne Blake']),
-            'status': 'planned',
-            'entry_time': '09:00',
-            'exit_time': '15:00',
-            'route_description': 'Enter via Historic Entrance, survey Gothic Avenue extension',
-            'hazards': 'Low crawls, tight squeezes',
-            'required_skills': json.dumps(['vertical', 'surveying']),
-            'required_equipment': json.dumps(['helmet', 'headlamp', 'survey_instruments']),
-            'max_participants': 6,
-            'difficulty_level': 'intermediate',
-            'notes': 'Looking for clues... I mean cave passages'
-        },
-        {
-            'trip_name': 'Scooby Snacks Underground Expedition',
-            'trip_date': base_date + timedelta(days=1),
-            'cave_name': 'Roppel Cave',
-            'objective': 'Push leads in the lunch room area',
-            'leader_name': 'Shaggy Rogers',
-            'participants': json.dumps(['Shaggy Rogers', 'Scooby-Doo', 'Velma Dinkley']),
-            'status': 'planned',
-            'entry_time': '10:00',
-            'exit_time': '16:00',
-            'route_description': 'Looking for the legendary underground kitchen',
-            'hazards': 'Possible hungry cavers',
-            'required_skills': json.dumps(['navigation']),
-            'required_equipment': json.dumps(['helmet', 'headlamp', 'extra_snacks']),
-            'max_participants': 4,
-            'difficulty_level': 'beginner',
-            'notes': 'Like, bring extra Scooby Snacks, man!'
-        },
-        {
-            'trip_name': 'Scientific Survey Expedition',
-            'trip_date': base_date + timedelta(days=2),
-            'cave_name': 'Crystal Onyx Cave',
-            'objective': 'Geological formations documentation',
-            'leader_name': 'Sandy Cheeks',
-            'participants': json.dumps(['Sandy Cheeks', 'Velma Dinkley', 'Fred Jones']),
-            'status': 'planned',
-            'entry_time': '08:00',
-            'exit_time': '17:00',
-            'route_description': 'Full scientific survey of formation room',
-            'hazards': 'Delicate formations, watch your step',
-            'required_skills': json.dumps(['surveying', 'photography', 'vertical']),
-            'required_equipment': json.dumps(['survey_instruments', 'camera', 'measuring_tape']),
-            'max_participants': 5,
-            'difficulty_level': 'advanced',
-            'notes': 'Texas-sized science expedition, y\'all!'
-        },
-        {
-            'trip_name': 'Mathematical Cave Adventure',
-            'trip_date': base_date + timedelta(days=3),
-            'cave_name': 'Hidden River Cave',
-            'objective': 'Explore uncharted passages',
-            'leader_name': 'Finn the Human',
-            'participants': json.dumps(['Finn the Human', 'Jake the Dog', 'Fred Jones']),
-            'status': 'planned',
-            'entry_time': '09:30',
-            'exit_time': '16:30',
-            'route_description': 'Adventure through new discoveries',
-            'hazards': 'Unknown passages, water features',
-            'required_skills': json.dumps(['vertical', 'navigation', 'rigging']),
-            'required_equipment': json.dumps(['helmet', 'headlamp', 'rope', 'webbing']),
-            'max_participants': 6,
-            'difficulty_level': 'intermediate',
-            'notes': 'Algebraic cave passages!'
-        },
-        {
-            'trip_name': 'Bikini Bottom Cave Dive... Er, Hike',
-            'trip_date': base_date + timedelta(days=1),
-            'cave_name': 'Morrison Cave',
-            'objective': 'Easy introduction trip',
-            'leader_name': 'SpongeBob SquarePants',
-            'participants': json.dumps(['SpongeBob SquarePants', 'Patrick Star', 'Sandy Cheeks']),
-            'status': 'planned',
-            'entry_time': '11:00',
-            'exit_time': '14:00',
-            'route_description': 'Gentle walking passages',
-            'hazards': 'Minimal, beginner-friendly',
-            'required_skills': json.dumps([]),
-            'required_equipment': json.dumps(['helmet', 'headlamp']),
-            'max_participants': 8,
-            'difficulty_level': 'beginner',
-            'notes': 'I\'m ready, I\'m ready, I\'m ready!'
-        }
-    ]
+    log("🏔️ Adding cave trips...")
+
+    trips = load_fixture('trips.json')
 
     cursor = conn.cursor()
-    for trip in trips:
-        cursor.execute('''
-            INSERT INTO trips
-            (trip_name, trip_date, cave_name, objective, leader_name,
-             entry_time, exit_time, route_description, hazards,
-             required_skills, required_equipment, max_participants,
-             difficulty_level, notes, participants, status, created_date)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-        ''', (
-            trip['trip_name'], trip['trip_date'], trip['cave_name'],
-            trip['objective'], trip['leader_name'], trip['entry_time'],
-            trip['exit_time'], trip['route_description'], trip['hazards'],
-            trip['required_skills'], trip['required_equipment'],
-            trip['max_participants'], trip['difficulty_level'],
-            trip['notes'], trip['participants'], trip['status']
-        ))
-
-    conn.commit()
-    print(f"✓ Added {len(trips)} cave trips")
+    now = datetime.now()
+    rows = [(
+        trip['trip_name'], trip['trip_date'], trip['cave_name'],
+        trip['objective'], trip['leader_name'], trip['entry_time'],
+        trip['exit_time'], trip['route_description'], trip['hazards'],
+        dump_list(trip['required_skills']), dump_list(trip['required_equipment']),
+        trip['max_participants'], trip['difficulty_level'],
+        trip['notes'], trip['status'], now
+    ) for trip in trips]
+
+    copy_rows(cursor, 'trips', TRIP_COLUMNS, rows)
+
+    # Rosters live in the trip_participants link table; COPY doesn't
+    # return ids, so map them back by the (unique) fixture names
+    cursor.execute('SELECT id, trip_name FROM trips')
+    trip_id_by_name = {trip_name: tid for tid, trip_name in cursor.fetchall()}
+    cursor.execute('SELECT id, full_name FROM participants')
+    name_to_id = {full_name: pid for pid, full_name in cursor.fetchall()}
+    roster_rows = [
+        (trip_id_by_name[trip['trip_name']], name_to_id[name])
+        for trip in trips
+        for name in trip['participants']
+        if name in name_to_id
+    ]
+    if roster_rows:
+        execute_values(cursor, SQL_INS_ROSTER, roster_rows)
+
+    log(f"✓ Added {len(trips)} cave trips")
 
 def populate_caves_and_surveys(conn):
     """Add sample caves and survey data"""
-    print("🗺️ Adding caves and survey data...")
+    log("🗺️ Adding caves and survey data...")
 
     cursor = conn.cursor()
 
@@ -367,36 +207,25 @@ def populate_caves_and_surveys(conn):
         ('Hidden River Cave', 'Kentucky - Demo Data')
     ]
 
-    cave_ids = []
-    for cave_name, location in caves:
-        cursor.execute('INSERT INTO caves (name, location_text) VALUES (%s, %s) RETURNING cave_id',
-                      (cave_name, location))
-        cave_ids.append(cursor.fetchone()[0])
+    cave_ids = [r[0] for r in execute_values(cursor, SQL_INS_CAVES, caves,
+                                             fetch=True)]
 
     # Add a sample survey
-    cursor.execute('''
-        INSERT INTO surveys
-        (cave_id, date, area_in_cave, objective, time_in, time_out, conditions,
-         survey_designation_raw, units_length, units_compass, units_clino)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING survey_id
-    ''', (cave_ids[0], '2025-10-11', 'Mystery Passage', 'Initial Survey',
+    cursor.execute(SQL_INS_SURVEY, (cave_ids[0], '2025-10-11', 'Mystery Passage', 'Initial Survey',
           '09:00', '15:00', 'Dry, excellent', 'DEMO-SURVEY-001',
           'feet', 'degrees', 'degrees'))
 
     survey_id = cursor.fetchone()[0]
 
-    # Add people for survey team
-    people_names = ['Velma Dinkley', 'Fred Jones', 'Daphne Blake']
-    for name in people_names:
-        cursor.execute('INSERT INTO people (full_name) VALUES (%s) RETURNING person_id', (name,))
-        person_id = cursor.fetchone()[0]
-
-        role = 'sketch_book' if name == 'Velma Dinkley' else ('foresight' if name == 'Fred Jones' else 'backsight')
-        cursor.execute('''
-            INSERT INTO survey_team (survey_id, person_id, display_name, role)
-            VALUES (%s, %s, %s, %s)
-        ''', (survey_id, person_id, name, role))
+    # Add people for survey team: one batch for the ids, one for the roles
+    team = [('Velma Dinkley', 'sketch_book'),
+            ('Fred Jones', 'foresight'),
+            ('Daphne Blake', 'backsight')]
+    person_ids = [r[0] for r in execute_values(
+        cursor, SQL_INS_PEOPLE, [(name,) for name, _ in team], fetch=True)]
+    execute_values(cursor, SQL_INS_TEAM,
+                   [(survey_id, pid, name, role)
+                    for pid, (name, role) in zip(person_ids, team)])
 
     # Add sample shots
     shots = [
@@ -405,83 +234,119 @@ def populate_caves_and_surveys(conn):
         ('A3', 'A4', 18.3, 135.0, 315.0, -10.0, 10.0, 3.0, 3.0, 6.0, 5.0),
     ]
 
-    for i, shot in enumerate(shots, 1):
-        cursor.execute('''
-            INSERT INTO shots
-            (survey_id, sequence_in_page, station_from, station_to, distance,
-             fs_azimuth_deg, bs_azimuth_deg, fs_incline_deg, bs_incline_deg,
-             lrud_left, lrud_right, lrud_up, lrud_down, note)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ''', (survey_id, i, *shot, 'Demo survey shot'))
+    execute_values(cursor, SQL_INS_SHOTS,
+                   [(survey_id, i, *shot, 'Demo survey shot')
+                    for i, shot in enumerate(shots, 1)], page_size=500)
+
+    log(f"✓ Added {len(caves)} caves and sample survey data")
 
-    conn.commit()
-    print(f"✓ Added {len(caves)} caves and sample survey data")
+def populate_bulk(conn, n):
+    """Generate n synthetic participants entirely server-side
+
+    For stress-testing beyond the 10 named characters: the rows are
+    built by generate_series inside Postgres, so nothing but this one
+    statement crosses the wire regardless of n.
+    """
+    log(f"📈 Generating {n} synthetic participants server-side...")
+
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO participants
+        (full_name, email, phone_number, address, emergency_contact,
+         accommodation, participation_days, eating_at_expedition,
+         crf_compass_agreement, skills, have_instruments, group_gear,
+         waiver_acknowledged, waiver_acknowledged_timestamp)
+        SELECT 'Demo Caver ' || g,
+               'demo' || g || '@example.demo',
+               '555-' || lpad((g %% 10000)::text, 4, '0'),
+               g || ' Synthetic Street, Demo City, KY',
+               'Demo Contact: 555-0000',
+               (ARRAY['tent', 'cabin', 'rv'])[1 + g %% 3],
+               '["2025-10-11", "2025-10-12"]'::jsonb,
+               g %% 2 = 0,
+               TRUE,
+               '["vertical"]'::jsonb,
+               FALSE,
+               '[]'::jsonb,
+               TRUE,
+               NOW()
+        FROM generate_series(1, %s) AS g
+    ''', (n,))
+
+    log(f"✓ Added {n} synthetic participants")
 
 def add_disclaimer_setting(conn):
     """Add or update the disclaimer setting"""
-    print("⚠️ Adding demonstration disclaimer...")
+    log("⚠️ Adding demonstration disclaimer...")
 
     cursor = conn.cursor()
     disclaimer_text = ("Mockup for demonstration purposes only. The data shown here does not reflect "
                       "the actual registration, cave trip, or survey data collected during the "
                       "October 2025 CKKC Expedition in Kentucky.")
 
-    cursor.execute('''
-        INSERT INTO settings (key, value, description, category, updated_date)
-        VALUES (%s, %s, %s, %s, NOW())
-        ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_date = NOW()
-    ''', ('demo_mode_disclaimer', disclaimer_text, 'Disclaimer for demo/mockup mode', 'system'))
+    cursor.execute(SQL_UPSERT_SETTING, (
+        'demo_mode_disclaimer', disclaimer_text,
+        'Disclaimer for demo/mockup mode', 'system'))
 
-    cursor.execute('''
-        INSERT INTO settings (key, value, description, category, updated_date)
-        VALUES (%s, %s, %s, %s, NOW())
-        ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_date = NOW()
-    ''', ('demo_mode_enabled', 'true', 'Whether demo mode is active', 'system'))
+    cursor.execute(SQL_UPSERT_SETTING, (
+        'demo_mode_enabled', 'true', 'Whether demo mode is active', 'system'))
 
-    conn.commit()
-    print("✓ Added demonstration disclaimer")
+    log("✓ Added demonstration disclaimer")
 
 def main():
-    """Main function to populate all dummy data"""
-    print("=" * 70)
-    print("🎬 CKKC Expedition - Dummy Data Population Script")
-    print("   Using fictional animation characters for demonstration")
-    print("=" * 70)
-    print()
+    """Main function to populate all dummy data
+
+    An optional integer argument adds that many synthetic participants
+    on top of the named fixtures: ./populate_dummy_data.py 10000
+    """
+    bulk = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+
+    log("=" * 70)
+    log("🎬 CKKC Expedition - Dummy Data Population Script")
+    log("   Using fictional animation characters for demonstration")
+    log("=" * 70)
+    log()
 
     try:
         conn = get_connection()
-        print(f"✓ Connected to database: {DATABASE_URL[:50]}...")
-        print()
-
-        # Populate data
-        clear_existing_data(conn)
-        populate_participants(conn)
-        populate_trips(conn)
-        populate_caves_and_surveys(conn)
-        add_disclaimer_setting(conn)
+        log(f"✓ Connected to database: {DATABASE_URL[:50]}...")
+        log()
+
+        # Populate data in one transaction: a failure anywhere rolls the
+        # whole run back, and Postgres flushes the WAL once at the end
+        with conn:
+            clear_existing_data(conn)
+            populate_participants(conn)
+            populate_trips(conn)
+            populate_caves_and_surveys(conn)
+            add_disclaimer_setting(conn)
+            if bulk:
+                populate_bulk(conn, bulk)
 
         conn.close()
 
-        print()
-        print("=" * 70)
-        print("✅ SUCCESS! Dummy data populated successfully!")
-        print()
-        print("📊 Summary:")
-        print("   - 10 Fictional participants (Scooby-Doo, SpongeBob, Adventure Time)")
-        print("   - 5 Demo cave trips")
-        print("   - 5 Demo caves with sample survey data")
-        print("   - Disclaimer added to settings")
-        print()
-        print("⚠️  REMINDER: This is demonstration data using fictional characters.")
-        print("   Clear this data before collecting real expedition information!")
-        print("=" * 70)
+        log()
+        log("=" * 70)
+        log("✅ SUCCESS! Dummy data populated successfully!")
+        log()
+        log("📊 Summary:")
+        log("   - 10 Fictional participants (Scooby-Doo, SpongeBob, Adventure Time)")
+        log("   - 5 Demo cave trips")
+        log("   - 5 Demo caves with sample survey data")
+        log("   - Disclaimer added to settings")
+        log()
+        log("⚠️  REMINDER: This is demonstration data using fictional characters.")
+        log("   Clear this data before collecting real expedition information!")
+        log("=" * 70)
 
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log(f"❌ Error: {e}")
+        flush_log()
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        flush_log()
 
     return 0
 
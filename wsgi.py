@@ -2,16 +2,19 @@
 """
 WSGI entry point for production deployment
 Used by Gunicorn and other WSGI servers
+
+The connection pool is NOT initialized here: under a multi-worker
+gunicorn this module can be imported in the master before forking, and
+psycopg2 pools are not fork-safe. The post_fork hook in gunicorn.conf.py
+builds one pool per worker instead.
 """
 
 from app import app, init_connection_pool
 
-# Initialize the database connection pool when the WSGI app starts
-init_connection_pool()
-
 # This is what Gunicorn will import
 application = app
 
 if __name__ == "__main__":
     # For testing wsgi.py directly
+    init_connection_pool()
     application.run()